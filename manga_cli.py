@@ -0,0 +1,185 @@
+"""Command-line front end: download chapters, merge PDFs and compile volumes without Qt.
+
+Examples:
+    python manga_cli.py download -i urls.txt -o ~/Manga --merge
+    python manga_cli.py download --job-db jobs.sqlite3 --resume -o ~/Manga
+    python manga_cli.py merge ~/Manga/chapter-1 ~/Manga/chapter-2
+    python manga_cli.py volume ~/Manga/volume-1.pdf ~/Manga/chapter-*
+"""
+import argparse
+import os
+import sys
+import threading
+
+from manga_core import (
+    DownloadJob, JobStore, PDF_JPEG_QUALITY, PDFMergeJob, PageTransform, VolumePDFJob, http_pool, load_plugins, page_cache,
+)
+
+
+def _read_urls(args):
+    urls = list(args.urls)
+    if args.input == "-":
+        urls.extend(line.strip() for line in sys.stdin)
+    elif args.input:
+        with open(args.input, "r", encoding="utf-8") as f:
+            urls.extend(line.strip() for line in f)
+    # Skip blanks and comments, keep the first occurrence of each URL
+    seen = set()
+    return [u for u in urls if u and not u.startswith("#") and not (u in seen or seen.add(u))]
+
+
+def _page_transform(args):
+    transform = PageTransform(args.max_width, args.grayscale, args.quality, args.split_strips)
+    if not transform.max_width and not transform.grayscale and not transform.split_strips and transform.jpeg_quality == PDF_JPEG_QUALITY:
+        return None
+    return transform
+
+
+def _run_job(job):
+    """Run ``job`` on a worker thread so Ctrl+C can stop it cleanly."""
+    worker = threading.Thread(target=job.run, name=type(job).__name__)
+    worker.start()
+    try:
+        while worker.is_alive():
+            worker.join(0.5)
+    except KeyboardInterrupt:
+        if hasattr(job, "stop"):
+            print("Stopping...", file=sys.stderr)
+            job.stop()
+        worker.join()
+        return 130
+    return 0
+
+
+def cmd_download(args):
+    urls = _read_urls(args)
+    job_store = JobStore(args.job_db) if args.job_db else None
+    if args.resume:
+        if job_store is None:
+            print("--resume needs --job-db.", file=sys.stderr)
+            return 2
+        # Unfinished chapters from earlier runs go first, in their recorded order
+        urls = list(dict.fromkeys(job_store.pending() + urls))
+    if job_store is not None:
+        job_store.add(urls)
+    if not urls:
+        print("No URLs given.", file=sys.stderr)
+        return 2
+    os.makedirs(args.output, exist_ok=True)
+    http_pool.configure(pool_size=args.host_connections, rate=args.host_rate)
+    page_cache.max_bytes = args.page_cache_mb * 1024 * 1024
+    job = DownloadJob(
+        urls, args.output, args.merge, args.workers,
+        args.selenium, args.driver_path, not args.show_browser, True,
+        chapter_concurrency=args.chapters, plugins=load_plugins(),
+        lazy_load_timeout=args.lazy_load_timeout,
+        engine=args.engine, async_in_flight=args.async_in_flight,
+        deduplicate=not args.no_dedupe,
+        jpeg_passthrough=not args.reencode_jpeg,
+        pdf_transform=_page_transform(args),
+        job_store=job_store,
+    )
+    statuses = {}
+    job.log_signal.connect(print)
+    job.status_signal.connect(statuses.__setitem__)
+    job.selenium_error_signal.connect(lambda msg: print(f"Selenium error: {msg}", file=sys.stderr))
+    code = _run_job(job)
+    if job_store is not None:
+        counts = job_store.status_counts()
+        print("Job store: " + ", ".join(f"{count} {status}" for status, count in sorted(counts.items())), file=sys.stderr)
+        job_store.close()
+    if code:
+        return code
+    failed = [(url, status) for url, status in statuses.items() if status in ("Failed", "Incomplete")]
+    for url, status in failed:
+        print(f"{status}: {url}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def cmd_merge(args):
+    job = PDFMergeJob(
+        args.folders, "Merge PDFs" if args.pdfs else "Merge Images", not args.reencode_jpeg,
+        max_workers=args.jobs, transform=_page_transform(args),
+    )
+    errors = []
+
+    def log(message, level):
+        print(message, file=sys.stderr if level in ("error", "warning") else sys.stdout)
+        if level == "error":
+            errors.append(message)
+
+    job.log_signal.connect(log)
+    return _run_job(job) or (1 if errors else 0)
+
+
+def cmd_volume(args):
+    job = VolumePDFJob(
+        args.folders, args.output, not args.reencode_jpeg,
+        max_workers=args.jobs, concat_pdfs=args.concat, transform=_page_transform(args),
+    )
+    job.log_signal.connect(print)
+    return _run_job(job) or (0 if job.succeeded else 1)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="manga_cli", description="Headless manga downloader and PDF tools.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    pdf_options = argparse.ArgumentParser(add_help=False)
+    group = pdf_options.add_argument_group("PDF pages")
+    group.add_argument("--max-width", type=int, default=0, help="shrink wider pages to this width in pixels (0 = keep)")
+    group.add_argument("--quality", type=int, default=PDF_JPEG_QUALITY, help="JPEG quality for re-encoded pages")
+    group.add_argument("--grayscale", action="store_true", help="store pages in grayscale")
+    group.add_argument("--split-strips", action="store_true", help="cut long webtoon strips into pages")
+    group.add_argument("--reencode-jpeg", action="store_true", help="re-encode JPEG sources instead of embedding them as-is")
+
+    download = sub.add_parser("download", parents=[pdf_options], help="download chapter URLs")
+    download.add_argument("urls", nargs="*", help="chapter URLs")
+    download.add_argument("-i", "--input", help="file with one URL per line ('-' for stdin)")
+    download.add_argument("-o", "--output", default=".", help="save folder (default: current directory)")
+    download.add_argument("--merge", action="store_true", help="merge each chapter's images into a PDF")
+    download.add_argument("-w", "--workers", type=int, default=6, help="concurrent image downloads")
+    download.add_argument("-c", "--chapters", type=int, default=2, help="chapters processed at the same time")
+    download.add_argument("--engine", choices=["threads", "asyncio"], default="threads", help="image download engine")
+    download.add_argument("--async-in-flight", type=int, default=256, help="max concurrent requests with --engine asyncio")
+    download.add_argument("--host-connections", type=int, default=http_pool.pool_size, help="keep-alive connections per host")
+    download.add_argument("--host-rate", type=float, default=http_pool.rate, help="requests per second per host (0 = unlimited)")
+    download.add_argument("--page-cache-mb", type=int, default=page_cache.max_bytes // (1024 * 1024), help="chapter page cache size")
+    download.add_argument("--job-db", help="SQLite job store recording chapter and image progress")
+    download.add_argument("--resume", action="store_true", help="also download the unfinished chapters recorded in --job-db")
+    download.add_argument("--no-dedupe", action="store_true", help="do not share identical images between chapters")
+    download.add_argument("--selenium", action="store_true", help="fall back to a headless browser for dynamic pages")
+    download.add_argument("--driver-path", default="", help="ChromeDriver executable (default: from PATH)")
+    download.add_argument("--show-browser", action="store_true", help="run Chrome with a visible window")
+    download.add_argument("--lazy-load-timeout", type=float, default=15.0, help="seconds to wait for lazy-loaded images")
+    download.set_defaults(func=cmd_download)
+
+    merge = sub.add_parser("merge", parents=[pdf_options], help="build one PDF per chapter folder")
+    merge.add_argument("folders", nargs="+", help="chapter folders")
+    merge.add_argument("--pdfs", action="store_true", help="concatenate the PDFs in each folder instead of its images")
+    merge.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    merge.set_defaults(func=cmd_merge)
+
+    volume = sub.add_parser("volume", parents=[pdf_options], help="compile chapter folders into one volume PDF")
+    volume.add_argument("output", help="volume PDF to create or update")
+    volume.add_argument("folders", nargs="+", help="chapter folders, in reading order after sorting by name")
+    volume.add_argument("--concat", action="store_true", help="join each chapter's existing PDF instead of its images")
+    volume.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    volume.set_defaults(func=cmd_volume)
+    return parser
+
+
+def main(argv=None):
+    import multiprocessing
+    multiprocessing.freeze_support()
+    args = build_parser().parse_args(argv)
+    if args.command in ("merge", "volume"):
+        args.folders = [f for f in args.folders if os.path.isdir(f)]
+        if not args.folders:
+            print("No chapter folders found.", file=sys.stderr)
+            return 2
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
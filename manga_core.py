@@ -0,0 +1,2459 @@
+"""Download, merge and volume engines shared by the GUI and the command line.
+
+Nothing here imports Qt: jobs report progress through ``JobSignal``
+callbacks, which the GUI re-emits as Qt signals from its worker threads.
+Heavy third-party modules (requests, BeautifulSoup, Pillow, pypdf,
+Selenium) are imported by the functions that use them, so importing this
+module stays cheap.
+"""
+import os
+import re
+import json
+import time
+import importlib.util
+import inspect
+import collections
+import functools
+from contextlib import asynccontextmanager, contextmanager
+import threading
+from urllib.parse import urljoin, urlparse
+from pathlib import Path
+
+import glob
+
+
+@functools.lru_cache(maxsize=None)
+def load_pypdf():
+    """Return the pypdf module (or PyPDF2 as a fallback), or None if neither is installed."""
+    try:
+        import pypdf
+    except ImportError:
+        try:
+            import PyPDF2 as pypdf
+        except ImportError:
+            pypdf = None
+    return pypdf
+
+
+PYPDF_MISSING = "pypdf or PyPDF2 is not installed; it is required to merge PDFs."
+
+
+def _pdf_add_outline(writer, title, page_index):
+    """Add a top-level bookmark with whichever API this pypdf/PyPDF2 release has."""
+    for name in ("add_outline_item", "add_bookmark", "addBookmark"):
+        add = getattr(writer, name, None)
+        if add is not None:
+            add(title, page_index)
+            return
+
+
+def _pdf_open_outlines(writer):
+    """Ask viewers to show the bookmarks panel (no-op on releases without page modes)."""
+    if hasattr(writer, "page_mode"):
+        writer.page_mode = "/UseOutlines"
+    elif hasattr(writer, "setPageMode"):
+        writer.setPageMode("/UseOutlines")
+
+
+@functools.lru_cache(maxsize=None)
+def load_selenium():
+    """Return ``(webdriver, By, ChromeOptions)``, all None if Selenium is not installed."""
+    try:
+        from selenium import webdriver
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.chrome.options import Options as ChromeOptions
+    except ImportError:
+        return None, None, None
+    return webdriver, By, ChromeOptions
+
+
+class JobSignal:
+    """Qt-free stand-in for a ``Signal`` declared on a job class.
+
+    Each job instance gets its own list of callbacks; ``emit`` calls them
+    synchronously in the emitting thread.
+    """
+
+    def __init__(self, *types):
+        self.types = types
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        return obj.__dict__.setdefault(self.name, _BoundJobSignal())
+
+
+class _BoundJobSignal:
+    def __init__(self):
+        self._slots = []
+
+    def connect(self, slot):
+        self._slots.append(slot)
+
+    def emit(self, *args):
+        for slot in list(self._slots):
+            slot(*args)
+
+
+def _plugin_accepts_html(plugin):
+    # Plugins written against the old get_image_urls(url) contract take no html
+    try:
+        return "html" in inspect.signature(plugin.get_image_urls).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+def plugin_uses_page_html(plugin):
+    """True if the core should pre-fetch the page and hand its HTML to the plugin."""
+    return _plugin_accepts_html(plugin) and getattr(plugin, "uses_page_html", True)
+
+
+def plugin_image_urls(plugin, url, html=None):
+    if _plugin_accepts_html(plugin):
+        return plugin.get_image_urls(url, html=html)
+    return plugin.get_image_urls(url)
+
+
+_plugin_modules = {}
+_plugin_lock = threading.Lock()
+
+
+def _import_plugin_module(path):
+    with _plugin_lock:
+        mod = _plugin_modules.get(path)
+        if mod is None:
+            fname = os.path.basename(path)
+            spec = importlib.util.spec_from_file_location(fname[:-3], path)
+            mod = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(mod)
+            _plugin_modules[path] = mod
+        return mod
+
+
+def _plugin_domains(path):
+    """Read ``{class name: domains}`` from a plugin file without executing it.
+
+    Returns None unless every class defining ``can_handle`` declares a
+    literal ``domains`` tuple, in which case the module can be loaded lazily.
+    """
+    import ast
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            tree = ast.parse(f.read(), path)
+    except (OSError, SyntaxError, ValueError):
+        return None
+    found = {}
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        domains = None
+        has_can_handle = False
+        for item in node.body:
+            if isinstance(item, ast.FunctionDef) and item.name == "can_handle":
+                has_can_handle = True
+            elif isinstance(item, ast.Assign) and any(isinstance(t, ast.Name) and t.id == "domains" for t in item.targets):
+                try:
+                    domains = tuple(ast.literal_eval(item.value))
+                except ValueError:
+                    return None
+        if domains:
+            found[node.name] = domains
+        elif has_can_handle:
+            return None
+    return found or None
+
+
+class LazyPlugin:
+    """Placeholder for a plugin that declares ``domains``.
+
+    ``can_handle`` answers from the domains alone until a URL matches; only
+    then is the plugin module imported (with its Selenium/webdriver imports)
+    and the real plugin asked. Attributes set on the placeholder, such as
+    the injected ``driver_pool``, are forwarded to the real plugin.
+    """
+
+    def __init__(self, path, class_name, domains):
+        self.__dict__.update(_path=path, _class_name=class_name, domains=domains, _plugin=None, _attrs={})
+
+    def _load(self):
+        if self._plugin is None:
+            plugin = getattr(_import_plugin_module(self._path), self._class_name)()
+            for name, value in self._attrs.items():
+                setattr(plugin, name, value)
+            self.__dict__["_plugin"] = plugin
+        return self._plugin
+
+    def can_handle(self, url):
+        if not any(domain in url for domain in self.domains):
+            return False
+        return self._load().can_handle(url)
+
+    def __getattr__(self, name):
+        if name in self._attrs:
+            return self._attrs[name]
+        return getattr(self._load(), name)
+
+    def __setattr__(self, name, value):
+        self._attrs[name] = value
+        if self._plugin is not None:
+            setattr(self._plugin, name, value)
+
+
+def load_plugins():
+    plugins = []
+    plugins_dir = os.path.join(os.path.dirname(__file__), "plugins")
+    if not os.path.isdir(plugins_dir):
+        return plugins
+    for fname in os.listdir(plugins_dir):
+        if fname.endswith("_plugin.py"):
+            path = os.path.join(plugins_dir, fname)
+            domains = _plugin_domains(path)
+            if domains:
+                # Registered from metadata; the module is imported on the first matching URL
+                plugins.extend(LazyPlugin(path, name, d) for name, d in domains.items())
+                continue
+            mod = _import_plugin_module(path)
+            for obj in mod.__dict__.values():
+                if inspect.isclass(obj) and hasattr(obj, "can_handle") and hasattr(obj, "get_image_urls"):
+                    # Skip abstract base classes
+                    if getattr(obj, "__abstractmethods__", None):
+                        continue
+                    plugins.append(obj())
+    return plugins
+
+
+DEFAULT_HEADERS = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36"}
+
+# Content-Type -> extension for image URLs that carry no extension
+IMAGE_CONTENT_TYPES = {
+    'image/jpeg': '.jpg',
+    'image/jpg': '.jpg',
+    'image/png': '.png',
+    'image/gif': '.gif',
+    'image/bmp': '.bmp',
+    'image/webp': '.webp',
+}
+
+
+def normalize_filename(name):
+    # Remove or replace problematic characters
+    name = re.sub(r'[\\/:*?"<>|]', '_', name)
+    name = re.sub(r'\s+', '_', name)
+    return name
+
+
+# Bytes held in memory per image worker while streaming a download to disk
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+
+def stream_to_file(response, path, chunk_size=DOWNLOAD_CHUNK_SIZE, append=False, keep_partial=False):
+    """Stream a response body to ``path`` via a ``.part`` file and atomic rename.
+
+    A page only appears under its final name once fully written, so an
+    interrupted download never looks like a finished image. With ``append``
+    the body continues an existing ``.part`` file (HTTP 206 resume); with
+    ``keep_partial`` a failed transfer leaves the ``.part`` file for resuming.
+    Returns the final file size.
+    """
+    part_path = path + ".part"
+    try:
+        with open(part_path, "ab" if append else "wb") as f:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                if chunk:
+                    f.write(chunk)
+        size = os.path.getsize(part_path)
+        os.replace(part_path, path)
+        return size
+    except BaseException:
+        if not keep_partial:
+            try:
+                os.remove(part_path)
+            except OSError:
+                pass
+        raise
+
+
+class ChapterManifest:
+    """Per-chapter record of image URL -> final filename, size, validators and status.
+
+    Stored as ``.manifest.json`` in the chapter folder so a rerun can skip
+    completed pages, resume partial ones and only fetch what is missing.
+    """
+
+    FILENAME = ".manifest.json"
+    SAVE_INTERVAL = 1.0  # seconds; updates in between are batched into one rewrite
+
+    def __init__(self, folder):
+        self.folder = folder
+        self.path = os.path.join(folder, self.FILENAME)
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._last_save = 0.0
+        self.entries = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+    def get(self, url):
+        with self._lock:
+            entry = self.entries.get(url)
+            return dict(entry) if entry else None
+
+    def reserve(self, url, name):
+        """Return the filename for ``url``, claiming a unique one on first sight."""
+        with self._lock:
+            entry = self.entries.get(url)
+            if entry:
+                return entry["filename"]
+            taken = {e["filename"] for e in self.entries.values()}
+            path = os.path.join(self.folder, name)
+            if name not in taken and os.path.isfile(path):
+                # Downloaded before manifests existed: adopt the file as complete
+                self.entries[url] = {"filename": name, "size": os.path.getsize(path), "etag": None, "last_modified": None, "status": "complete"}
+                self._save_locked()
+                return name
+            root, ext = os.path.splitext(name)
+            candidate = name
+            counter = 1
+            while candidate in taken or os.path.exists(os.path.join(self.folder, candidate)):
+                # Append _1, _2, etc. before extension
+                candidate = f"{root}_{counter}{ext}"
+                counter += 1
+            self.entries[url] = {"filename": candidate, "size": None, "etag": None, "last_modified": None, "status": "pending"}
+            return candidate
+
+    def is_complete(self, url):
+        with self._lock:
+            entry = self.entries.get(url)
+            if not entry or entry.get("status") != "complete":
+                return False
+            path = os.path.join(self.folder, entry["filename"])
+            return os.path.isfile(path) and os.path.getsize(path) == entry.get("size")
+
+    def update(self, url, **fields):
+        with self._lock:
+            self.entries.setdefault(url, {}).update(fields)
+            self._dirty = True
+            if time.monotonic() - self._last_save >= self.SAVE_INTERVAL:
+                self._save_locked()
+
+    def flush(self):
+        """Write any batched updates now."""
+        with self._lock:
+            if self._dirty:
+                self._save_locked()
+
+    def _save_locked(self):
+        self._dirty = False
+        self._last_save = time.monotonic()
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
+
+
+JOB_STORE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS chapters (
+    url TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'Queued',
+    folder TEXT,
+    images_total INTEGER NOT NULL DEFAULT 0,
+    images_done INTEGER NOT NULL DEFAULT 0,
+    bytes INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created REAL NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS chapters_status ON chapters (status, position);
+CREATE TABLE IF NOT EXISTS images (
+    chapter TEXT NOT NULL REFERENCES chapters (url) ON DELETE CASCADE,
+    url TEXT NOT NULL,
+    filename TEXT,
+    status TEXT NOT NULL,
+    bytes INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    updated REAL NOT NULL,
+    PRIMARY KEY (chapter, url)
+);
+CREATE INDEX IF NOT EXISTS images_status ON images (chapter, status);
+"""
+
+
+class JobStore:
+    """Durable record of the download queue in SQLite.
+
+    One row per chapter (queue position, status, image counts, bytes,
+    attempts, timestamps) and one per image (filename, status, bytes,
+    attempts, last error). Workers write each change in its own short
+    transaction, so a crash loses at most the image in flight, and "what is
+    left" is an indexed status query instead of a directory scan.
+    """
+
+    DONE_STATUSES = ("Completed", "Skipped")
+
+    def __init__(self, path):
+        import sqlite3
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("PRAGMA foreign_keys=ON")
+        self._db.executescript(JOB_STORE_SCHEMA)
+
+    @contextmanager
+    def _transaction(self):
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._db
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+
+    def replace_queue(self, urls):
+        """Make ``urls`` the queue, in order; chapters no longer listed are dropped with their images."""
+        now = time.time()
+        urls = list(dict.fromkeys(urls))
+        with self._transaction() as db:
+            db.execute("CREATE TEMP TABLE IF NOT EXISTS keep (url TEXT PRIMARY KEY)")
+            db.execute("DELETE FROM keep")
+            db.executemany("INSERT INTO keep VALUES (?)", ((url,) for url in urls))
+            db.execute("DELETE FROM chapters WHERE url NOT IN (SELECT url FROM keep)")
+            db.executemany(
+                "INSERT INTO chapters (url, position, status, created, updated) VALUES (?, ?, 'Queued', ?, ?) "
+                "ON CONFLICT (url) DO UPDATE SET position = excluded.position, status = 'Queued', updated = excluded.updated",
+                ((url, position, now, now) for position, url in enumerate(urls))
+            )
+
+    def add(self, urls, status="Queued"):
+        """Append ``urls`` to the end of the queue, leaving ones already present alone."""
+        now = time.time()
+        with self._transaction() as db:
+            start = db.execute("SELECT COALESCE(MAX(position) + 1, 0) FROM chapters").fetchone()[0]
+            db.executemany(
+                "INSERT OR IGNORE INTO chapters (url, position, status, created, updated) VALUES (?, ?, ?, ?, ?)",
+                ((url, start + offset, status, now, now) for offset, url in enumerate(urls))
+            )
+
+    def remove(self, url):
+        with self._transaction() as db:
+            db.execute("DELETE FROM chapters WHERE url = ?", (url,))
+
+    def set_status(self, url, status):
+        with self._transaction() as db:
+            db.execute("UPDATE chapters SET status = ?, updated = ? WHERE url = ?", (status, time.time(), url))
+
+    def start_chapter(self, url, folder, images_total):
+        """Reset a chapter's counters at the start of a (re)run and count the attempt."""
+        with self._transaction() as db:
+            db.execute(
+                "UPDATE chapters SET folder = ?, images_total = ?, images_done = 0, bytes = 0, attempts = attempts + 1, "
+                "updated = ? WHERE url = ?",
+                (folder, images_total, time.time(), url)
+            )
+
+    def record_image(self, chapter, url, filename, status, size=0, error=None):
+        """Record one image result; ``status`` is complete, linked, skipped or failed.
+
+        Does nothing if the chapter was removed from the queue while its
+        worker was still finishing.
+        """
+        now = time.time()
+        done = status != "failed"
+        with self._transaction() as db:
+            if db.execute("SELECT 1 FROM chapters WHERE url = ?", (chapter,)).fetchone() is None:
+                return
+            db.execute(
+                "INSERT INTO images (chapter, url, filename, status, bytes, attempts, error, updated) VALUES (?, ?, ?, ?, ?, 1, ?, ?) "
+                "ON CONFLICT (chapter, url) DO UPDATE SET filename = COALESCE(excluded.filename, filename), status = excluded.status, "
+                "bytes = excluded.bytes, attempts = attempts + 1, error = excluded.error, updated = excluded.updated",
+                (chapter, url, filename, status, size or 0, error, now)
+            )
+            if done:
+                db.execute(
+                    "UPDATE chapters SET images_done = images_done + 1, bytes = bytes + ?, updated = ? WHERE url = ?",
+                    (size or 0, now, chapter)
+                )
+
+    def chapters(self):
+        """``(url, status, images_done, images_total)`` for every queued chapter, in queue order."""
+        with self._lock:
+            return self._db.execute(
+                "SELECT url, status, images_done, images_total FROM chapters ORDER BY position"
+            ).fetchall()
+
+    def pending(self):
+        """URLs that still need a run, in queue order.
+
+        That is anything not completed or skipped, plus chapters recorded as
+        done that still have missing or failed images.
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT url FROM chapters WHERE status NOT IN (?, ?) OR images_done < images_total "
+                "OR EXISTS (SELECT 1 FROM images WHERE chapter = chapters.url AND status = 'failed') "
+                "ORDER BY position", self.DONE_STATUSES
+            ).fetchall()
+        return [url for url, in rows]
+
+    def status_counts(self):
+        with self._lock:
+            return dict(self._db.execute("SELECT status, COUNT(*) FROM chapters GROUP BY status"))
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class ImageBlobStore:
+    """Content-addressed image store shared by every chapter under one save folder.
+
+    Each distinct image is kept once as ``<sha256><ext>`` and hardlinked into
+    chapter folders (copied where hardlinks are unsupported). An append-only
+    URL -> blob index lets images seen before be linked without refetching.
+    """
+
+    DIRNAME = ".blobs"
+
+    def __init__(self, output_folder):
+        self.folder = os.path.join(output_folder, self.DIRNAME)
+        self.index_path = os.path.join(self.folder, "index.jsonl")
+        self._lock = threading.Lock()
+        self._by_url = {}
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        self._by_url[record["url"]] = record["blob"]
+                    except (ValueError, KeyError):
+                        continue
+        except OSError:
+            pass
+
+    @staticmethod
+    def _hash_file(path):
+        import hashlib
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _link(src, dest):
+        try:
+            os.link(src, dest)
+        except OSError:
+            import shutil
+            shutil.copy2(src, dest)
+
+    def blob_for_url(self, url):
+        """Return the stored blob path for ``url`` if it was fetched before."""
+        with self._lock:
+            blob = self._by_url.get(url)
+        if blob:
+            path = os.path.join(self.folder, blob)
+            if os.path.isfile(path):
+                return path
+        return None
+
+    def link_into(self, blob_path, dest):
+        if os.path.exists(dest):
+            os.remove(dest)
+        self._link(blob_path, dest)
+
+    def ingest(self, url, path):
+        """Move a freshly downloaded file into the store and leave a link at ``path``."""
+        blob = self._hash_file(path) + os.path.splitext(path)[1].lower()
+        blob_path = os.path.join(self.folder, blob)
+        with self._lock:
+            os.makedirs(self.folder, exist_ok=True)
+            if os.path.isfile(blob_path):
+                if not os.path.samefile(path, blob_path):
+                    # Same bytes already stored: replace the new copy with a link
+                    tmp_path = path + ".link"
+                    self._link(blob_path, tmp_path)
+                    try:
+                        os.replace(tmp_path, path)
+                    finally:
+                        # rename() between two links to one file is a no-op that leaves the source behind
+                        if os.path.lexists(tmp_path):
+                            os.remove(tmp_path)
+            else:
+                self._link(path, blob_path)
+            if self._by_url.get(url) != blob:
+                self._by_url[url] = blob
+                with open(self.index_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps({"url": url, "blob": blob}) + "\n")
+        return blob_path
+
+
+class TokenBucket:
+    """Thread-safe token bucket; rate <= 0 disables limiting."""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token, returning how many seconds the caller must wait before using it."""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            # Tokens may go negative: each waiter queues behind the ones before it
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self):
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+
+class HostSessionPool:
+    """Process-wide keep-alive sessions and rate limiters, one per host (netloc).
+
+    Every page and image fetch goes through here so chapters hitting the
+    same CDN reuse its connections and share one request budget. Rate
+    limiting is off (``rate=0``) unless a per-host rate is configured.
+    """
+
+    def __init__(self, pool_size=16, rate=0.0, burst=None):
+        self.pool_size = pool_size
+        self.rate = rate
+        self.burst = burst
+        self._sessions = {}
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def configure(self, pool_size=None, rate=None, burst=None):
+        with self._lock:
+            if pool_size is not None and pool_size != self.pool_size:
+                self.pool_size = pool_size
+                # Drop old sessions; new ones pick up the pool size
+                for session in self._sessions.values():
+                    session.close()
+                self._sessions.clear()
+            if rate is not None:
+                self.rate = rate
+            if burst is not None:
+                self.burst = burst
+            for bucket in self._buckets.values():
+                bucket.rate = self.rate
+                bucket.burst = self._burst()
+
+    def _burst(self):
+        # Default burst: one second's worth of requests
+        return max(1, self.burst or int(self.rate))
+
+    def session_for(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._sessions[host] = session
+            return session
+
+    def limiter_for(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.rate, self._burst())
+                self._buckets[host] = bucket
+            return bucket
+
+    def get(self, url, **kwargs):
+        self.limiter_for(url).acquire()
+        return self.session_for(url).get(url, **kwargs)
+
+    def close(self):
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+
+http_pool = HostSessionPool()
+
+
+class PageCache:
+    """On-disk HTTP cache for chapter pages, keyed by URL.
+
+    Stores the body with its ETag/Last-Modified so repeat visits can be
+    revalidated with If-None-Match/If-Modified-Since; least recently used
+    entries are evicted once the bodies exceed ``max_bytes`` (0 disables).
+    """
+
+    def __init__(self, folder, max_bytes=200 * 1024 * 1024):
+        self.folder = Path(folder)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._index = None
+
+    def _index_path(self):
+        return self.folder / "index.json"
+
+    def _body_path(self, key):
+        return self.folder / f"{key}.html"
+
+    @staticmethod
+    def _key(url):
+        import hashlib
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _load_locked(self):
+        if self._index is None:
+            try:
+                with open(self._index_path(), "r", encoding="utf-8") as f:
+                    self._index = json.load(f)
+            except (OSError, ValueError):
+                self._index = {}
+        return self._index
+
+    def _save_locked(self):
+        try:
+            self.folder.mkdir(parents=True, exist_ok=True)
+            tmp_path = self._index_path().with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._index, f)
+            os.replace(tmp_path, self._index_path())
+        except OSError:
+            pass
+
+    def lookup(self, url):
+        """Return ``(entry, body)`` for a cached URL, or None."""
+        if self.max_bytes <= 0:
+            return None
+        key = self._key(url)
+        with self._lock:
+            entry = self._load_locked().get(key)
+            if not entry:
+                return None
+            try:
+                body = self._body_path(key).read_text(encoding="utf-8")
+            except OSError:
+                del self._index[key]
+                return None
+            return dict(entry), body
+
+    def conditional_headers(self, entry):
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def touch(self, url):
+        key = self._key(url)
+        with self._lock:
+            entry = self._load_locked().get(key)
+            if entry:
+                entry["last_access"] = time.time()
+                self._save_locked()
+
+    def store(self, url, response):
+        """Cache a 200 response if it carries a validator to revalidate with."""
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if self.max_bytes <= 0 or not (etag or last_modified):
+            return
+        body = response.text.encode("utf-8")
+        if len(body) > self.max_bytes:
+            return
+        key = self._key(url)
+        with self._lock:
+            index = self._load_locked()
+            try:
+                self.folder.mkdir(parents=True, exist_ok=True)
+                tmp_path = self._body_path(key).with_suffix(".tmp")
+                with open(tmp_path, "wb") as f:
+                    f.write(body)
+                os.replace(tmp_path, self._body_path(key))
+            except OSError:
+                return
+            index[key] = {"url": url, "etag": etag, "last_modified": last_modified, "size": len(body), "last_access": time.time()}
+            self._evict_locked()
+            self._save_locked()
+
+    def _evict_locked(self):
+        total = sum(e.get("size", 0) for e in self._index.values())
+        if total <= self.max_bytes:
+            return
+        for key, entry in sorted(self._index.items(), key=lambda kv: kv[1].get("last_access", 0)):
+            if total <= self.max_bytes:
+                break
+            try:
+                self._body_path(key).unlink()
+            except OSError:
+                pass
+            total -= entry.get("size", 0)
+            del self._index[key]
+
+    def fetch(self, url, headers=None, timeout=30):
+        """GET ``url`` through http_pool, revalidating a cached copy. Returns the page text."""
+        request_headers = dict(headers or {})
+        cached = self.lookup(url)
+        if cached:
+            request_headers.update(self.conditional_headers(cached[0]))
+        response = http_pool.get(url, headers=request_headers, timeout=timeout)
+        if response.status_code == 304 and cached:
+            self.touch(url)
+            return cached[1]
+        response.raise_for_status()
+        self.store(url, response)
+        return response.text
+
+
+class AsyncHttpEngine:
+    """asyncio/aiohttp event loop on a background thread for image fetches.
+
+    Coroutines are scheduled from worker threads with ``submit()``, which
+    returns a ``concurrent.futures.Future``, so chapter workers keep using
+    ``as_completed()`` and emitting the usual job signals. Requires aiohttp.
+    """
+
+    def __init__(self, max_in_flight=256, limit_per_host=16):
+        self.max_in_flight = max(1, max_in_flight)
+        self.limit_per_host = max(1, limit_per_host)
+        self._loop = None
+        self._thread = None
+        self._session = None
+        self._semaphore = None
+
+    def start(self):
+        import asyncio
+        import aiohttp  # noqa: F401  (fail early if the optional dependency is missing)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop, name="AsyncHttpEngine", daemon=True)
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._open(), self._loop).result()
+
+    def _run_loop(self):
+        import asyncio
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    async def _open(self):
+        import asyncio
+        import aiohttp
+        connector = aiohttp.TCPConnector(limit=self.max_in_flight, limit_per_host=self.limit_per_host)
+        self._session = aiohttp.ClientSession(connector=connector)
+        self._semaphore = asyncio.Semaphore(self.max_in_flight)
+
+    def submit(self, coro_fn, *args):
+        import asyncio
+        return asyncio.run_coroutine_threadsafe(coro_fn(*args), self._loop)
+
+    @asynccontextmanager
+    async def get(self, url, **kwargs):
+        """GET through the shared session, honouring http_pool's per-host rate limit."""
+        import asyncio
+        wait = http_pool.limiter_for(url).reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        async with self._semaphore:
+            async with self._session.get(url, **kwargs) as response:
+                yield response
+
+    def close(self):
+        import asyncio
+        if self._loop is None:
+            return
+        if self._session is not None:
+            asyncio.run_coroutine_threadsafe(self._session.close(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+
+
+page_cache = PageCache(Path.home() / ".manga_downloader_cache" / "pages")
+
+# Page loads after which a pooled WebDriver is restarted to cap memory growth
+DRIVER_RECYCLE_PAGES = 50
+
+
+def make_chrome_driver(driver_path="", headless=True):
+    """Start a Chrome WebDriver with the app's standard options."""
+    webdriver, _, ChromeOptions = load_selenium()
+    if webdriver is None or ChromeOptions is None:
+        raise RuntimeError("Selenium is not installed. Please install selenium and try again.")
+    chrome_options = ChromeOptions()
+    if headless:
+        chrome_options.add_argument('--headless')
+    chrome_options.add_argument('--disable-gpu')
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    if driver_path:
+        from selenium.webdriver.chrome.service import Service as ChromeService
+        return webdriver.Chrome(service=ChromeService(driver_path), options=chrome_options)
+    return webdriver.Chrome(options=chrome_options)
+
+
+class DriverStartError(RuntimeError):
+    """Raised by WebDriverPool when a new browser cannot be started."""
+
+
+class WebDriverPool:
+    """Bounded pool of warm WebDrivers shared by the core and plugins.
+
+    Drivers are leased with ``with pool.lease() as driver:``, health-checked
+    before each lease and recycled after ``max_pages`` page loads.
+    """
+
+    def __init__(self, factory, size=2, max_pages=50):
+        self.factory = factory
+        self.size = max(1, size)
+        self.max_pages = max_pages
+        self._idle = []
+        self._pages = {}
+        self._created = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def warm(self, count=None):
+        """Start up to ``count`` drivers in the background so first leases are cheap."""
+        count = self.size if count is None else min(count, self.size)
+
+        def start_one():
+            try:
+                driver = self._create()
+            except DriverStartError:
+                return
+            if driver is not None:
+                self._release(driver)
+
+        with self._cond:
+            missing = max(0, count - self._created)
+        for _ in range(missing):
+            threading.Thread(target=start_one, daemon=True).start()
+
+    def _create(self):
+        with self._cond:
+            if self._closed or self._created >= self.size:
+                return None
+            self._created += 1
+        try:
+            driver = self.factory()
+        except Exception as e:
+            with self._cond:
+                self._created -= 1
+                self._cond.notify()
+            raise DriverStartError(str(e)) from e
+        with self._cond:
+            self._pages[driver] = 0
+        return driver
+
+    def _acquire(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._cond:
+                if self._closed:
+                    raise RuntimeError("WebDriver pool is closed")
+                if self._idle:
+                    driver = self._idle.pop()
+                elif self._created < self.size:
+                    driver = None
+                else:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError("Timed out waiting for a WebDriver")
+                    self._cond.wait(remaining)
+                    continue
+            if driver is None:
+                driver = self._create()
+                if driver is None:
+                    continue
+                return driver
+            if self._is_healthy(driver):
+                return driver
+            self._discard(driver)
+
+    @staticmethod
+    def _is_healthy(driver):
+        try:
+            driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    def _release(self, driver):
+        with self._cond:
+            if self._closed:
+                recycle = True
+            else:
+                recycle = self._pages.get(driver, 0) >= self.max_pages
+            if not recycle:
+                self._idle.append(driver)
+                self._cond.notify()
+                return
+        self._discard(driver)
+
+    def _discard(self, driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        with self._cond:
+            if self._pages.pop(driver, None) is not None:
+                self._created -= 1
+            self._cond.notify()
+
+    @contextmanager
+    def lease(self, timeout=None):
+        driver = self._acquire(timeout)
+        healthy = True
+        try:
+            yield driver
+        except Exception:
+            healthy = self._is_healthy(driver)
+            raise
+        finally:
+            with self._cond:
+                if driver in self._pages:
+                    self._pages[driver] += 1
+            if healthy:
+                self._release(driver)
+            else:
+                self._discard(driver)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for driver in idle:
+            self._discard(driver)
+
+
+# JPEG quality used when a page has to be (re-)encoded for a PDF
+PDF_JPEG_QUALITY = 90
+
+
+def _pdf_text(text):
+    """Encode a string as a PDF text string (UTF-16BE hex for non-ASCII)."""
+    try:
+        raw = text.encode("ascii")
+        escaped = raw.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+        return b"(" + escaped + b")"
+    except UnicodeEncodeError:
+        return b"<FEFF" + text.encode("utf-16-be").hex().upper().encode("ascii") + b">"
+
+
+class StreamingPDFWriter:
+    """Write an image-per-page PDF one page at a time.
+
+    Each page's image is written to disk as soon as it is added and then
+    released, so memory stays flat however many pages a volume has. Only
+    page object numbers (and bookmarks) are kept until ``close()``. The file
+    is written to ``<path>.tmp`` and renamed into place on success.
+
+    With ``jpeg_passthrough`` JPEG source files are embedded byte-for-byte as
+    DCT streams; only other formats are decoded and encoded. With
+    ``uniform_page_size`` every image is centred on a page as large as the
+    largest image added, resolved at ``close()`` so callers need no sizing pass.
+
+    Passing the ``state`` of a previous writer appends pages to that PDF as an
+    incremental update: existing pages are left untouched on disk and only the
+    new objects, page tree, outline and cross-reference section are written.
+    """
+
+    def __init__(self, path, jpeg_quality=PDF_JPEG_QUALITY, jpeg_passthrough=True, uniform_page_size=False, append_state=None, transform=None):
+        self.path = str(path)
+        self.jpeg_quality = jpeg_quality
+        self.transform = transform
+        self.jpeg_passthrough = jpeg_passthrough
+        self.uniform_page_size = uniform_page_size
+        self._deferred = []  # (image_num, width, height) awaiting the final page size
+        self._max_size = (0, 0)
+        self._offsets = {}
+        self._base = append_state
+        self.state = None
+        if append_state:
+            if os.path.getsize(self.path) != append_state["size"]:
+                raise ValueError(f"{self.path} changed since it was last written")
+            self._tmp_path = None
+            self._f = open(self.path, "r+b")
+            self._f.seek(0, os.SEEK_END)
+            self._next_obj = append_state["next_obj"]
+            self._pages = list(append_state["pages"])
+            self._bookmarks = [tuple(b) for b in append_state["bookmarks"]]
+        else:
+            self._tmp_path = self.path + ".tmp"
+            self._f = open(self._tmp_path, "wb")
+            self._next_obj = 3  # 1 = Catalog, 2 = Pages
+            self._pages = []
+            self._bookmarks = []
+            self._f.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    @property
+    def page_count(self):
+        return len(self._pages) + len(self._deferred)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+    def _alloc(self):
+        num = self._next_obj
+        self._next_obj += 1
+        return num
+
+    def _write_obj(self, num, body, stream=None):
+        self._offsets[num] = self._f.tell()
+        self._f.write(b"%d 0 obj\n" % num)
+        self._f.write(body)
+        if stream is not None:
+            self._f.write(b"\nstream\n")
+            self._f.write(stream)
+            self._f.write(b"\nendstream")
+        self._f.write(b"\nendobj\n")
+
+    def add_jpeg(self, data, width, height, components=3, page_size=None):
+        """Embed already-encoded JPEG bytes as a page without decoding them.
+
+        With ``page_size`` the image is centred on a page of that size
+        (the uncovered area stays white) instead of filling its own page.
+        """
+        colorspace = {1: b"/DeviceGray", 3: b"/DeviceRGB", 4: b"/DeviceCMYK"}[components]
+        image_num = self._alloc()
+        self._write_obj(
+            image_num,
+            b"<< /Type /XObject /Subtype /Image /Width %d /Height %d /ColorSpace %s "
+            b"/BitsPerComponent 8 /Filter /DCTDecode /Length %d >>" % (width, height, colorspace, len(data)),
+            data,
+        )
+        if self.uniform_page_size and page_size is None:
+            self._deferred.append((image_num, width, height))
+            self._max_size = (max(self._max_size[0], width), max(self._max_size[1], height))
+        else:
+            self._pages.append(self._write_page(image_num, width, height, page_size))
+
+    def _write_page(self, image_num, width, height, page_size=None):
+        page_w, page_h = page_size or (width, height)
+        x = (page_w - width) // 2
+        y = (page_h - height) - (page_h - height) // 2
+        content_num, page_num = self._alloc(), self._alloc()
+        content = b"q %d 0 0 %d %d %d cm /Im0 Do Q" % (width, height, x, y)
+        self._write_obj(content_num, b"<< /Length %d >>" % len(content), content)
+        self._write_obj(
+            page_num,
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] "
+            b"/Resources << /XObject << /Im0 %d 0 R >> >> /Contents %d 0 R >>" % (page_w, page_h, image_num, content_num),
+        )
+        return page_num
+
+    def add_image_file(self, path, page_size=None):
+        """Append an image file (possibly as several pages), embedding JPEGs as-is when passthrough is enabled."""
+        for data, width, height, components in encode_pdf_pages(path, self.jpeg_passthrough, self.jpeg_quality, self.transform):
+            self.add_jpeg(data, width, height, components, page_size)
+
+    def add_bookmark(self, title, page_index=None):
+        """Add a top-level outline entry pointing at ``page_index`` (default: next page added)."""
+        self._bookmarks.append((title, self.page_count if page_index is None else page_index))
+
+    def _write_outlines(self):
+        entries = [(t, i) for t, i in self._bookmarks if 0 <= i < len(self._pages)]
+        if not entries:
+            return None
+        outlines_num = self._alloc()
+        item_nums = [self._alloc() for _ in entries]
+        for idx, (title, page_index) in enumerate(entries):
+            body = b"<< /Title " + _pdf_text(title) + b" /Parent %d 0 R /Dest [%d 0 R /Fit]" % (outlines_num, self._pages[page_index])
+            if idx > 0:
+                body += b" /Prev %d 0 R" % item_nums[idx - 1]
+            if idx < len(entries) - 1:
+                body += b" /Next %d 0 R" % item_nums[idx + 1]
+            self._write_obj(item_nums[idx], body + b" >>")
+        self._write_obj(
+            outlines_num,
+            b"<< /Type /Outlines /First %d 0 R /Last %d 0 R /Count %d >>" % (item_nums[0], item_nums[-1], len(entries)),
+        )
+        return outlines_num
+
+    def close(self):
+        if self._f is None:
+            return
+        for image_num, width, height in self._deferred:
+            self._pages.append(self._write_page(image_num, width, height, self._max_size))
+        self._deferred = []
+        kids = b" ".join(b"%d 0 R" % n for n in self._pages)
+        self._write_obj(2, b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % len(self._pages))
+        outlines_num = self._write_outlines()
+        catalog = b"<< /Type /Catalog /Pages 2 0 R"
+        if outlines_num:
+            catalog += b" /Outlines %d 0 R /PageMode /UseOutlines" % outlines_num
+        self._write_obj(1, catalog + b" >>")
+        xref_offset = self._f.tell()
+        if self._base:
+            # Incremental update: only objects 1-2 and the newly allocated range changed
+            first_new = self._base["next_obj"]
+            self._f.write(b"xref\n0 3\n0000000000 65535 f \n")
+            for num in (1, 2):
+                self._f.write(b"%010d 00000 n \n" % self._offsets[num])
+            self._f.write(b"%d %d\n" % (first_new, self._next_obj - first_new))
+            for num in range(first_new, self._next_obj):
+                self._f.write(b"%010d 00000 n \n" % self._offsets[num])
+            prev = b" /Prev %d" % self._base["xref"]
+        else:
+            self._f.write(b"xref\n0 %d\n" % self._next_obj)
+            self._f.write(b"0000000000 65535 f \n")
+            for num in range(1, self._next_obj):
+                self._f.write(b"%010d 00000 n \n" % self._offsets[num])
+            prev = b""
+        self._f.write(b"trailer\n<< /Size %d /Root 1 0 R%s >>\nstartxref\n%d\n%%%%EOF\n" % (self._next_obj, prev, xref_offset))
+        size = self._f.tell()
+        self._f.close()
+        self._f = None
+        if self._tmp_path:
+            os.replace(self._tmp_path, self.path)
+        self.state = {
+            "size": size, "xref": xref_offset, "next_obj": self._next_obj,
+            "pages": self._pages, "bookmarks": self._bookmarks,
+        }
+
+    def abort(self):
+        """Discard a partially written PDF (or the partial update of an appended one)."""
+        if self._f is not None:
+            if self._base:
+                self._f.truncate(self._base["size"])
+            self._f.close()
+            self._f = None
+        if self._tmp_path:
+            try:
+                os.remove(self._tmp_path)
+            except OSError:
+                pass
+
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.gif', '.webp')
+
+
+STRIP_PAGE_RATIO = 1.5  # height/width of pages cut from long webtoon strips
+STRIP_BAND_TOLERANCE = 12  # max brightness spread across a row that still counts as blank
+
+
+def find_strip_cuts(img, page_ratio=STRIP_PAGE_RATIO, tolerance=STRIP_BAND_TOLERANCE):
+    """Return the row offsets at which to cut a tall strip into reader-sized pages.
+
+    Each page is at most ``page_ratio`` times as tall as it is wide. Cuts
+    are placed in the middle of a near-uniform horizontal band (gutter
+    between panels) in the lower part of each page, found from per-row
+    brightness range over the whole pixel array; if a page has no such band
+    (or NumPy is not installed) it is cut at full height. A band wider than
+    the search window is cut in the middle of the part inside the window:
+
+    >>> from PIL import Image
+    >>> find_strip_cuts(Image.new("L", (100, 700), 255))
+    [113, 226, 339, 452, 565]
+    """
+    # At least two rows per page so every cut advances (1 px wide spacers would otherwise loop forever)
+    page_h = max(2, int(img.width * page_ratio))
+    if img.height <= page_h:
+        return []
+    try:
+        import numpy as np
+    except ImportError:
+        return list(range(page_h, img.height, page_h))
+    rows = np.asarray(img.convert("L"))
+    blank = np.ptp(rows, axis=1) <= tolerance
+    # Band edges, so a cut can be centred in the gutter it lands in
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], blank.view(np.int8), [0]))))
+    starts, ends = edges[::2], edges[1::2]
+    cuts = []
+    top = 0
+    while img.height - top > page_h:
+        lo, hi = top + max(1, page_h // 2), top + page_h
+        candidates = np.flatnonzero(blank[lo:hi])
+        if candidates.size:
+            row = lo + int(candidates[-1])
+            band = np.searchsorted(starts, row, side="right") - 1
+            # Centre the cut on the part of the gutter inside [lo, hi]
+            cut = (max(int(starts[band]), lo) + min(int(ends[band]), hi) + 1) // 2
+        else:
+            cut = hi
+        cuts.append(cut)
+        top = cut
+    return cuts
+
+
+class PageTransform:
+    """Optional downscale/recompress step applied to each page before it is embedded.
+
+    ``max_width`` (0 = keep) shrinks wider pages proportionally, ``grayscale``
+    stores pages as single-channel JPEGs (ideal for black-and-white manga),
+    ``split_strips`` cuts long webtoon strips into several pages and
+    ``jpeg_quality`` is used for every page that gets re-encoded. Plain
+    attributes only, so instances pickle into worker processes.
+    """
+
+    def __init__(self, max_width=0, grayscale=False, jpeg_quality=PDF_JPEG_QUALITY, split_strips=False):
+        self.max_width = max_width
+        self.grayscale = grayscale
+        self.jpeg_quality = jpeg_quality
+        self.split_strips = split_strips
+
+    def changes(self, img):
+        """Whether ``img`` (opened, not yet decoded) needs more than a byte-for-byte copy."""
+        if self.split_strips:
+            width = min(img.width, self.max_width) if self.max_width else img.width
+            if img.height * width / img.width > width * STRIP_PAGE_RATIO:
+                return True
+        return bool(self.max_width and img.width > self.max_width) or (self.grayscale and img.mode != "L")
+
+    def apply(self, img):
+        if self.grayscale and img.mode != "L":
+            img = img.convert("L")
+        if self.max_width and img.width > self.max_width:
+            height = max(1, round(img.height * self.max_width / img.width))
+            from PIL import Image
+            img = img.resize((self.max_width, height), Image.LANCZOS)
+        return img
+
+
+def _encode_jpeg(img, jpeg_quality):
+    import io
+    if img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")
+    buf = io.BytesIO()
+    img.save(buf, format="JPEG", quality=jpeg_quality)
+    return buf.getvalue(), img.width, img.height, 1 if img.mode == "L" else 3
+
+
+def encode_pdf_pages(path, jpeg_passthrough=True, jpeg_quality=PDF_JPEG_QUALITY, transform=None):
+    """Return a list of ``(jpeg_bytes, width, height, components)`` PDF pages for one image.
+
+    Top-level so it can run in a process pool; JPEG sources are returned
+    as-is when ``jpeg_passthrough`` is set and ``transform`` leaves them alone.
+    Long strips become several pages when ``transform.split_strips`` is set.
+    """
+    from PIL import Image
+    if transform is not None:
+        jpeg_quality = transform.jpeg_quality
+    with Image.open(path) as img:
+        # Image.open only parses the header, so this check costs no pixel decode
+        if (jpeg_passthrough and img.format == "JPEG" and img.mode in ("L", "RGB")
+                and not (transform and transform.changes(img))):
+            with open(path, "rb") as f:
+                return [(f.read(), img.width, img.height, 1 if img.mode == "L" else 3)]
+        if transform is None:
+            return [_encode_jpeg(img, jpeg_quality)]
+        # Shrink JPEGs during decode where possible (draft picks a 1/2, 1/4 or 1/8 scale)
+        if transform.max_width and img.format == "JPEG" and img.width > transform.max_width:
+            img.draft(img.mode, (transform.max_width, img.height * transform.max_width // img.width))
+        img = transform.apply(img)
+        if not transform.split_strips:
+            return [_encode_jpeg(img, jpeg_quality)]
+        bounds = [0] + find_strip_cuts(img) + [img.height]
+        return [_encode_jpeg(img.crop((0, top, img.width, bottom)), jpeg_quality) for top, bottom in zip(bounds, bounds[1:])]
+
+
+def ordered_parallel_map(executor, fn, items, window):
+    """Yield futures for ``fn(item)`` in input order, keeping at most ``window`` in flight."""
+    pending = collections.deque()
+    for item in items:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= window:
+            yield pending.popleft()
+    while pending:
+        yield pending.popleft()
+
+
+def build_chapter_pdf(folder, jpeg_passthrough=True, transform=None):
+    """Merge the images of one chapter folder into ``<folder>/<name>.pdf``.
+
+    Runs in a worker process; returns ``(pdf_path or None, [(level, message), ...])``.
+    """
+    folder = Path(folder)
+    messages = []
+    image_files = [f for f in sorted(folder.glob('*')) if f.suffix.lower() in IMAGE_EXTENSIONS]
+    if not image_files:
+        return None, [("warning", f"No images found in {folder}.")]
+    pdf_path = folder / (folder.name + '.pdf')
+    try:
+        with StreamingPDFWriter(pdf_path, jpeg_passthrough=jpeg_passthrough, transform=transform) as writer:
+            for img_path in image_files:
+                try:
+                    writer.add_image_file(str(img_path))
+                except Exception as e:
+                    messages.append(("error", f"Failed to open {img_path}: {e}"))
+            pages = writer.page_count
+            if not pages:
+                writer.abort()
+        if not pages:
+            messages.append(("warning", f"No valid images to merge in {folder}."))
+            return None, messages
+        messages.append(("success", f"PDF created: {pdf_path}"))
+        return str(pdf_path), messages
+    except Exception as e:
+        messages.append(("error", f"Failed to create PDF in {folder}: {e}"))
+        return None, messages
+
+
+def merge_folder_pdfs(folder):
+    """Concatenate the PDFs in one folder into ``<folder>/<name>_merged.pdf`` (worker process)."""
+    folder = Path(folder)
+    messages = []
+    pdf_files = sorted(folder.glob('*.pdf'))
+    if not pdf_files:
+        return None, [("warning", f"No PDFs found in {folder}.")]
+    pypdf = load_pypdf()
+    if pypdf is None:
+        return None, [("error", PYPDF_MISSING)]
+    merger = pypdf.PdfWriter()
+    for pdf_path in pdf_files:
+        try:
+            reader = pypdf.PdfReader(str(pdf_path))
+            for page in reader.pages:
+                merger.add_page(page)
+        except Exception as e:
+            messages.append(("error", f"Failed to read {pdf_path}: {e}"))
+    merged_pdf_path = folder / (folder.name + '_merged.pdf')
+    try:
+        with open(merged_pdf_path, "wb") as f:
+            merger.write(f)
+        messages.append(("success", f"Merged PDF created: {merged_pdf_path}"))
+        return str(merged_pdf_path), messages
+    except Exception as e:
+        messages.append(("error", f"Failed to create merged PDF in {folder}: {e}"))
+        return None, messages
+
+
+def pdf_process_pool(max_workers=None):
+    """Process pool for PDF work; spawn-based so it is safe to start from Qt worker threads."""
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    return ProcessPoolExecutor(max_workers=max_workers or os.cpu_count() or 1, mp_context=multiprocessing.get_context("spawn"))
+
+
+class VolumeIndex:
+    """Sidecar record of which chapter folders fed which pages of a volume PDF.
+
+    Stored as ``<volume>.pdf.index.json`` together with the writer state, so a
+    later compile can append only the chapters added since (as an incremental
+    update) instead of re-encoding the whole volume.
+    """
+
+    SUFFIX = ".index.json"
+
+    def __init__(self, pdf_path):
+        self.pdf_path = str(pdf_path)
+        self.path = self.pdf_path + self.SUFFIX
+        self.chapters = []
+        self.writer_state = None
+        self.options = None
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.chapters = data["chapters"]
+            self.writer_state = data["writer"]
+            self.options = data.get("options")
+        except (OSError, ValueError, KeyError):
+            pass
+
+    @staticmethod
+    def signature(image_files):
+        """Names and sizes of a chapter's images; any change means the chapter must be rebuilt."""
+        return [[os.path.basename(f), os.path.getsize(f)] for f in image_files]
+
+    def reusable_chapters(self, chapters, options=None):
+        """Return how many leading ``(folder, image_files)`` entries the existing PDF already holds.
+
+        Appending is only possible when the indexed chapters are an unchanged
+        prefix of ``chapters``, the page ``options`` match and the PDF is
+        exactly as this index left it.
+        """
+        state = self.writer_state
+        if not state or not self.chapters or len(self.chapters) > len(chapters) or self.options != options:
+            return 0
+        try:
+            if os.path.getsize(self.pdf_path) != state["size"]:
+                return 0
+        except OSError:
+            return 0
+        for entry, (folder, image_files) in zip(self.chapters, chapters):
+            if entry["folder"] != os.path.basename(folder) or entry["images"] != self.signature(image_files):
+                return 0
+        return len(self.chapters)
+
+    def reset(self):
+        self.chapters = []
+        self.writer_state = None
+
+    def add_chapter(self, folder, image_files, first_page, page_count):
+        self.chapters.append({
+            "folder": os.path.basename(folder), "images": self.signature(image_files),
+            "first_page": first_page, "page_count": page_count,
+        })
+
+    def save(self, writer_state, options=None):
+        self.writer_state = writer_state
+        self.options = options
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"chapters": self.chapters, "writer": writer_state, "options": options}, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
+
+
+PROGRESS_INTERVAL = 0.25  # seconds between coalesced progress snapshots
+
+
+class ProgressAggregator:
+    """Coalesces progress from download workers into periodic snapshots.
+
+    Workers only append events to a deque (atomic, no lock taken). A ticker
+    thread drains it every ``interval`` seconds, updates the per-chapter page
+    counters and global byte total, and calls ``publish(snapshot, log_lines)``
+    once with the chapters that changed and any queued per-image log lines.
+    The snapshot carries pages done/total, bytes, smoothed rates and an ETA.
+    """
+
+    def __init__(self, publish, interval=PROGRESS_INTERVAL):
+        self._publish = publish
+        self.interval = interval
+        self._events = collections.deque()
+        self._chapters = {}  # url -> [done, total]
+        self._pages_done = 0
+        self._pages_total = 0
+        self._bytes = 0
+        self._page_rate = 0.0
+        self._byte_rate = 0.0
+        self._last_flush = None
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def add_chapter(self, url, total):
+        self._events.append(("chapter", url, total))
+
+    def page_done(self, url):
+        self._events.append(("page", url, 1))
+
+    def add_bytes(self, count):
+        self._events.append(("bytes", None, count))
+
+    def log(self, message):
+        self._events.append(("log", None, message))
+
+    def start(self):
+        self._last_flush = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="ProgressAggregator", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop ticking and publish whatever is still queued."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.flush()
+
+    def flush(self):
+        """Publish queued events now; safe to call from any thread."""
+        with self._flush_lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        changed = {}
+        lines = []
+        pages = 0
+        byte_count = 0
+        while True:
+            try:
+                kind, url, value = self._events.popleft()
+            except IndexError:
+                break
+            if kind == "log":
+                lines.append(value)
+                continue
+            if kind == "bytes":
+                byte_count += value
+                continue
+            counters = self._chapters.setdefault(url, [0, 0])
+            if kind == "chapter":
+                counters[1] = value
+                self._pages_total += value
+            else:
+                counters[0] += value
+                pages += value
+            changed[url] = tuple(counters)
+        if not (changed or lines or byte_count):
+            return
+        now = time.monotonic()
+        elapsed = max(now - (self._last_flush or now), 1e-3)
+        self._last_flush = now
+        self._pages_done += pages
+        self._bytes += byte_count
+        # Exponentially smoothed rates keep the ETA from jumping on bursty CDNs
+        self._page_rate = 0.7 * self._page_rate + 0.3 * (pages / elapsed) if self._page_rate else pages / elapsed
+        self._byte_rate = 0.7 * self._byte_rate + 0.3 * (byte_count / elapsed) if self._byte_rate else byte_count / elapsed
+        remaining = self._pages_total - self._pages_done
+        snapshot = {
+            "pages_done": self._pages_done,
+            "pages_total": self._pages_total,
+            "bytes": self._bytes,
+            "bytes_per_sec": self._byte_rate,
+            "eta": remaining / self._page_rate if self._page_rate > 0 and remaining > 0 else None,
+            "chapters": changed,
+        }
+        self._publish(snapshot, lines)
+
+
+class DownloadJob:
+    """Single download scheduler for a whole queue of chapter URLs.
+
+    Chapters are fed in queue order through a bounded pool of chapter
+    workers (page fetch + image extraction); every chapter shares one
+    bounded pool of image workers.
+    """
+    log_signal = JobSignal(str)
+    finished_signal = JobSignal()
+    # Coalesced progress (see ProgressAggregator): pages, bytes, rates, ETA and changed chapters
+    snapshot_signal = JobSignal(dict)
+    status_signal = JobSignal(str, str)  # url, status
+    selenium_error_signal = JobSignal(str)
+
+    def __init__(self, urls, output_folder, auto_merge, concurrency, use_selenium=False, selenium_driver_path="", headless_mode=True, log_num_images_found=True, chapter_concurrency=1, plugins=None, lazy_load_timeout=15.0, engine="threads", async_in_flight=256, deduplicate=True, jpeg_passthrough=True, pdf_transform=None, job_store=None):
+        self.urls = list(urls)
+        self.output_folder = output_folder
+        self.auto_merge = auto_merge
+        self.concurrency = max(1, concurrency)
+        self.chapter_concurrency = max(1, chapter_concurrency)
+        self.use_selenium = use_selenium
+        self.selenium_driver_path = selenium_driver_path
+        self.headless_mode = headless_mode
+        self.log_num_images_found = True  # Always log
+        self.plugins = plugins if plugins is not None else []
+        self.lazy_load_timeout = lazy_load_timeout
+        # "threads": ThreadPoolExecutor image workers; "asyncio": one event loop for every chapter's images
+        self.engine = engine
+        self.async_in_flight = async_in_flight
+        self._async_engine = None
+        # Content-addressed store shared by all chapters under output_folder
+        self._blob_store = ImageBlobStore(output_folder) if deduplicate else None
+        self.jpeg_passthrough = jpeg_passthrough
+        self.pdf_transform = pdf_transform
+        # Optional JobStore: chapter statuses and per-image results are recorded as they happen
+        self.job_store = job_store
+        self._pause_event = threading.Event()
+        self._pause_event.set()  # Not paused by default
+        self._stop_event = threading.Event()
+        self._stop_event.clear()
+        # Per-URL pause/stop controls: url -> {'pause': Event, 'stop': Event}
+        self._url_controls = {}
+        self._chapter_futures = {}
+        self._lock = threading.Lock()
+        self._queue_changed = threading.Event()
+        self._closed = False
+        self._chapter_executor = None
+        self._image_executor = None
+        # Headless browsers shared by the Selenium fallback and plugins, at most one per chapter worker
+        self._driver_pool = WebDriverPool(
+            lambda: make_chrome_driver(self.selenium_driver_path, self.headless_mode),
+            size=self.chapter_concurrency, max_pages=DRIVER_RECYCLE_PAGES
+        )
+        self._selenium_error_reported = False
+        self._total_downloaded = 0
+        self._progress = ProgressAggregator(self._publish_progress)
+        for url in self.urls:
+            self._url_controls[url] = self._new_url_control()
+
+    @staticmethod
+    def _new_url_control():
+        pause = threading.Event()
+        pause.set()
+        # started: the chapter has begun downloading; parked: paused before starting, holding no worker
+        return {'pause': pause, 'stop': threading.Event(), 'started': False, 'parked': False}
+
+    def stop(self):
+        self._stop_event.set()
+        self._pause_event.set()  # Unpause if paused, so thread can exit
+        self._queue_changed.set()
+        with self._lock:
+            for future in self._chapter_futures.values():
+                future.cancel()
+
+    def pause(self):
+        self._pause_event.clear()
+
+    def resume(self):
+        self._pause_event.set()
+
+    def pause_url(self, url):
+        control = self._url_controls.get(url)
+        if control:
+            control['pause'].clear()
+
+    def resume_url(self, url):
+        """Resume ``url``; returns True if it had already started downloading, False if it is queued again."""
+        control = self._url_controls.get(url)
+        if not control:
+            return False
+        with self._lock:
+            control['pause'].set()
+            if control['parked']:
+                # Paused before it started: it gave up its worker, so queue it again
+                control['parked'] = False
+                if not self._closed and self._chapter_executor is not None:
+                    self._chapter_futures[url] = self._chapter_executor.submit(self._run_chapter, url)
+                self._queue_changed.set()
+            return control['started']
+
+    def stop_url(self, url):
+        control = self._url_controls.get(url)
+        if control:
+            control['stop'].set()
+            control['pause'].set()
+        with self._lock:
+            if control:
+                control['parked'] = False
+                self._queue_changed.set()
+            future = self._chapter_futures.get(url)
+            if future is not None:
+                future.cancel()
+
+    def add_url(self, url):
+        """Queue another URL on the running scheduler.
+
+        Returns False if the scheduler has already drained its queue, in
+        which case the caller should start a new one.
+        """
+        with self._lock:
+            if self._closed or self._stop_event.is_set() or self._chapter_executor is None:
+                return False
+            self._url_controls[url] = self._new_url_control()
+            self._chapter_futures[url] = self._chapter_executor.submit(self._run_chapter, url)
+            return True
+
+    def _is_stopped(self, control):
+        return self._stop_event.is_set() or control['stop'].is_set()
+
+    def _claim_or_park(self, control):
+        """Called when a queued chapter reaches a worker; returns False if it should not run now.
+
+        A chapter paused before it started hands its worker back to the rest
+        of the queue (resume_url resubmits it) instead of sleeping on it.
+        """
+        while True:
+            with self._lock:
+                if self._is_stopped(control):
+                    return False
+                if not control['pause'].is_set():
+                    control['parked'] = True
+                    self._queue_changed.set()
+                    return False
+                if self._pause_event.is_set():
+                    control['started'] = True
+                    return True
+            time.sleep(0.1)
+
+    def _wait_if_paused(self, control):
+        while not (self._pause_event.is_set() and control['pause'].is_set()):
+            if self._is_stopped(control):
+                return
+            time.sleep(0.1)
+
+    def run(self):
+        from concurrent.futures import ThreadPoolExecutor, wait
+        # Everything from here on is torn down in the finally block, and finished_signal
+        # is always emitted, even if setup fails part-way
+        try:
+            for plugin in self.plugins:
+                plugin.driver_pool = self._driver_pool
+                plugin.lazy_load_timeout = self.lazy_load_timeout
+            if self.use_selenium and load_selenium()[0] is not None:
+                self._driver_pool.warm()
+            self._progress.start()
+            self._image_executor = ThreadPoolExecutor(max_workers=self.concurrency)
+            if self.engine == "asyncio":
+                self._start_async_engine()
+            with self._lock:
+                self._chapter_executor = ThreadPoolExecutor(max_workers=self.chapter_concurrency)
+                for url in self.urls:
+                    self._chapter_futures[url] = self._chapter_executor.submit(self._run_chapter, url)
+            while True:
+                with self._lock:
+                    self._queue_changed.clear()
+                    pending = [f for f in self._chapter_futures.values() if not f.done()]
+                    parked = not self._stop_event.is_set() and any(c['parked'] for c in self._url_controls.values())
+                    if not pending and not parked:
+                        break
+                if pending:
+                    wait(pending)
+                else:
+                    # Only parked (paused, not started) chapters left: wait for a resume or stop
+                    self._queue_changed.wait(0.5)
+        except Exception as e:
+            self.log_signal.emit(f"Download failed: {e}")
+        finally:
+            with self._lock:
+                self._closed = True
+            if self._chapter_executor is not None:
+                self._chapter_executor.shutdown(wait=True)
+            if self._image_executor is not None:
+                self._image_executor.shutdown(wait=True)
+            if self._async_engine is not None:
+                self._async_engine.close()
+            for plugin in self.plugins:
+                if getattr(plugin, 'driver_pool', None) is self._driver_pool:
+                    plugin.driver_pool = None
+            self._driver_pool.close()
+            self._progress.stop()
+        if self._stop_event.is_set():
+            self.log_signal.emit("Download stopped by user.")
+        self.log_signal.emit(f"\nTotal images downloaded from all URLs: {self._total_downloaded}")
+        self.finished_signal.emit()
+
+    def _start_async_engine(self):
+        engine = AsyncHttpEngine(self.async_in_flight, http_pool.pool_size)
+        try:
+            engine.start()
+        except ImportError:
+            self.log_signal.emit("aiohttp is not installed; falling back to the thread download engine.")
+        except Exception as e:
+            self.log_signal.emit(f"Could not start the asyncio download engine ({e}); falling back to the thread download engine.")
+        else:
+            self._async_engine = engine
+            return
+        try:
+            engine.close()
+        except Exception:
+            pass
+
+    def _set_status(self, url, status):
+        if self.job_store is not None:
+            self.job_store.set_status(url, status)
+        self.status_signal.emit(url, status)
+
+    def _publish_progress(self, snapshot, lines):
+        # Per-image log lines travel as one multi-line message per tick
+        if lines:
+            self.log_signal.emit("\n".join(lines))
+        self.snapshot_signal.emit(snapshot)
+
+    def _report_selenium_error(self, e):
+        error_msg = f"Failed to initialize Selenium driver: {e}"
+        self.log_signal.emit(error_msg)
+        with self._lock:
+            report = not self._selenium_error_reported
+            self._selenium_error_reported = True
+        if report:
+            self.selenium_error_signal.emit(error_msg)
+
+    def _chapter_folder(self, url):
+        parsed = urlparse(url)
+        path_parts = [p for p in parsed.path.split('/') if p]
+        folder_name = parsed.netloc
+        chapter_pattern = re.compile(r'(vol\d+[-_ ]*)?(ch|chapter)[-_ ]*(\d+)', re.IGNORECASE)
+        chapter_name = None
+        for part in reversed(path_parts):
+            match = chapter_pattern.search(part)
+            if match:
+                chapter_name = match.group(0).replace('_', '-').replace(' ', '-')
+                break
+        if not chapter_name and path_parts:
+            chapter_name = path_parts[-1]
+        if chapter_name:
+            folder_name = f"{parsed.netloc}_{chapter_name}"
+        folder_name = folder_name.replace(':', '_').replace('?', '_').replace('&', '_').replace('=', '_')
+        return os.path.join(self.output_folder, folder_name)
+
+    def _find_plugin(self, url):
+        for plugin in self.plugins:
+            try:
+                if plugin.can_handle(url):
+                    return plugin
+            except Exception as e:
+                self.log_signal.emit(f"Plugin error for {url}: {e}")
+        return None
+
+    def _fetch_page_html(self, url):
+        # Conditional request against the on-disk cache; re-scans mostly get 304s
+        return page_cache.fetch(url, headers=DEFAULT_HEADERS, timeout=30)
+
+    def _needs_page_html(self, plugin):
+        # Browser-based extraction loads the page itself; only pre-fetch when the HTML is consumed
+        if plugin is not None:
+            return plugin_uses_page_html(plugin)
+        return not (self.use_selenium and load_selenium()[0] is not None)
+
+    def _extract_image_urls(self, url, plugin=None, html=None):
+        # Use plugin system for image extraction
+        if plugin is not None:
+            try:
+                return plugin_image_urls(plugin, url, html)
+            except Exception as e:
+                self.log_signal.emit(f"Plugin error for {url}: {e}")
+        # fallback: try to extract all <img> tags
+        if self.use_selenium and load_selenium()[0] is not None:
+            try:
+                with self._driver_pool.lease() as driver:
+                    return self._extract_with_selenium(driver, url)
+            except DriverStartError as e:
+                self._report_selenium_error(e)
+        if html is None:
+            html = self._fetch_page_html(url)
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(html, "html.parser")
+        img_tags = soup.find_all("img")
+        return [urljoin(url, img.get("src")) for img in img_tags if img.get("src")]
+
+    def _extract_with_selenium(self, driver, url):
+        from selenium.common.exceptions import TimeoutException, WebDriverException
+        from plugins.browser_utils import wait_for_lazy_images
+        By = load_selenium()[1]
+        max_retries = 3
+        for attempt in range(1, max_retries + 1):
+            try:
+                driver.get(url)
+                # Scroll until lazy-loaded images stop appearing (bounded by the configured ceiling)
+                wait_for_lazy_images(driver, self.lazy_load_timeout)
+                img_elements = driver.find_elements(By.TAG_NAME, "img")
+                return [img.get_attribute("src") for img in img_elements if img.get_attribute("src")]
+            except (TimeoutException, WebDriverException) as e:
+                if attempt == max_retries:
+                    self.log_signal.emit(f"Selenium error for {url}: {e}")
+                    return []
+                self.log_signal.emit(f"Selenium timeout/error for {url}, retrying ({attempt}/{max_retries})...")
+                time.sleep(2)
+        return []
+
+    def _run_chapter(self, url):
+        # A chapter worker must never die silently: report the error and mark the chapter failed
+        try:
+            self._process_chapter(url)
+        except Exception as e:
+            import traceback
+            self.log_signal.emit(f"Error while processing {url}: {e}\n{traceback.format_exc()}")
+            try:
+                self._set_status(url, "Failed")
+            except Exception:
+                self.status_signal.emit(url, "Failed")
+
+    def _process_chapter(self, url):
+        control = self._url_controls[url]
+        if not self._claim_or_park(control):
+            return
+        self._set_status(url, "Downloading")
+        self.log_signal.emit(f"\nProcessing: {url}")
+        url_folder = self._chapter_folder(url)
+        os.makedirs(url_folder, exist_ok=True)
+        headers = DEFAULT_HEADERS
+        # Fetch the chapter page once and hand the body to the extraction stage
+        plugin = self._find_plugin(url)
+        html = None
+        if self._needs_page_html(plugin):
+            try:
+                html = self._fetch_page_html(url)
+            except Exception as e:
+                self.log_signal.emit(f"Failed to fetch page: {e}")
+                self._set_status(url, "Failed")
+                return
+        try:
+            image_urls = self._extract_image_urls(url, plugin, html)
+        except Exception as e:
+            self.log_signal.emit(f"Failed to fetch page: {e}")
+            self._set_status(url, "Failed")
+            return
+        # The same image listed twice must not be fetched twice into one file
+        image_urls = list(dict.fromkeys(urljoin(url, src) for src in image_urls if src))
+        # Log number of images found if enabled
+        if self.log_num_images_found:
+            self.log_signal.emit(f"Number of images found for {url}: {len(image_urls)}")
+        from concurrent.futures import as_completed
+
+        downloaded = 0
+        failed = 0
+        total_imgs = len(image_urls)
+        self._progress.add_chapter(url, total_imgs)
+        if self.job_store is not None:
+            self.job_store.start_chapter(url, url_folder, total_imgs)
+        manifest = ChapterManifest(url_folder)
+        futures = {self._submit_image(src, url, manifest, headers, control): src for src in image_urls}
+        try:
+            for future in as_completed(futures):
+                # Pause support
+                self._wait_if_paused(control)
+                # Early exit if stop requested
+                if self._is_stopped(control):
+                    break
+                success, name_or_url, err = future.result()
+                self._progress.page_done(url)
+                # Log every successful download, skip, or failure (batched by the aggregator)
+                if success is True:
+                    self._progress.log(f"Downloaded: {name_or_url}")
+                    downloaded += 1
+                elif success == 'linked':
+                    self._progress.log(f"Reused stored copy: {name_or_url}")
+                    downloaded += 1
+                elif success == 'skipped':
+                    self._progress.log(f"Skipped existing: {name_or_url}")
+                elif not success and name_or_url:
+                    self._progress.log(f"Failed to download {name_or_url}: {err}")
+                    failed += 1
+                if success is True or success == 'linked':
+                    # Counted per image so the run total stays right if the chapter stops or fails later
+                    with self._lock:
+                        self._total_downloaded += 1
+                if self.job_store is not None:
+                    self._record_image(url, futures[future], manifest, success, err)
+            # If stop requested, cancel remaining futures
+            if self._is_stopped(control):
+                for fut in futures:
+                    fut.cancel()
+                return
+        finally:
+            manifest.flush()
+        # Publish this chapter's per-image lines before its summary, status and PDF messages
+        self._progress.flush()
+        self.log_signal.emit(f"Images downloaded from this page: {downloaded}")
+        # "Incomplete": some pages are on disk but others failed, so the chapter still needs a rerun
+        if not failed:
+            status = "Completed"
+        else:
+            status = "Failed" if failed == total_imgs else "Incomplete"
+        self._set_status(url, status)
+        # Auto-merge to PDF if enabled
+        if self.auto_merge and downloaded > 0:
+            self._merge_images_to_pdf(url_folder)
+
+    def _record_image(self, chapter_url, img_url_full, manifest, success, err):
+        entry = manifest.get(img_url_full) or {}
+        if success is True:
+            status = "complete"
+        elif success in ("linked", "skipped"):
+            status = success
+        else:
+            status = "failed"
+        self.job_store.record_image(chapter_url, img_url_full, entry.get("filename"), status, entry.get("size") or 0, err)
+
+    def _submit_image(self, *args):
+        if self._async_engine is not None:
+            return self._async_engine.submit(self._download_image_async, *args)
+        return self._image_executor.submit(self._download_image, *args)
+
+    def _prepare_image(self, img_url, page_url, manifest, control):
+        """Resolve an image URL to its manifest filename.
+
+        Returns ``(img_url_full, img_name, result)``; ``result`` is the final
+        result tuple when nothing needs downloading, else None.
+        """
+        # Early exit if stop requested
+        if self._is_stopped(control) or not img_url:
+            return None, None, (False, None, None)
+        img_url_full = urljoin(page_url, img_url)
+        img_name = os.path.basename(urlparse(img_url_full).path)
+        if not img_name:
+            return img_url_full, None, (False, img_url_full, None)
+        img_name = normalize_filename(img_name)
+        # The manifest keeps one filename per URL, so reruns reuse it instead of adding _1, _2 copies
+        img_name = manifest.reserve(img_url_full, img_name)
+        if manifest.is_complete(img_url_full):
+            return img_url_full, img_name, ('skipped', img_name, None)
+        # Seen in another chapter before: link the stored copy instead of fetching it again
+        blob_path = self._blob_store.blob_for_url(img_url_full) if self._blob_store is not None else None
+        if blob_path:
+            root, ext = os.path.splitext(img_name)
+            if not ext:
+                img_name = root + os.path.splitext(blob_path)[1]
+            try:
+                self._blob_store.link_into(blob_path, os.path.join(manifest.folder, img_name))
+                manifest.update(img_url_full, filename=img_name, size=os.path.getsize(blob_path), status="complete")
+                return img_url_full, img_name, ('linked', img_name, None)
+            except OSError:
+                pass
+        return img_url_full, img_name, None
+
+    def _finish_image(self, manifest, img_url_full, img_path, size):
+        manifest.update(img_url_full, size=size, status="complete")
+        self._progress.add_bytes(size)
+        if self._blob_store is not None:
+            try:
+                self._blob_store.ingest(img_url_full, img_path)
+            except OSError as e:
+                self.log_signal.emit(f"Could not add {os.path.basename(img_path)} to the image store: {e}")
+
+    @staticmethod
+    def _resume_request(manifest, img_url_full, img_path, headers):
+        # Resume a validated partial download with a Range request
+        entry = manifest.get(img_url_full) or {}
+        validator = entry.get("etag") or entry.get("last_modified")
+        part_path = img_path + ".part"
+        offset = os.path.getsize(part_path) if os.path.isfile(part_path) else 0
+        request_headers = dict(headers)
+        if offset and validator:
+            request_headers["Range"] = f"bytes={offset}-"
+            request_headers["If-Range"] = validator
+        return request_headers, part_path, offset
+
+    @staticmethod
+    def _start_image_response(manifest, img_url_full, img_name, status, response_headers):
+        """Record a 200/206 response in the manifest; returns the final filename."""
+        root, ext = os.path.splitext(img_name)
+        # If no extension, use Content-Type to determine extension
+        if not ext:
+            content_type = response_headers.get('Content-Type', '').lower()
+            new_ext = IMAGE_CONTENT_TYPES.get(content_type, '')
+            if new_ext:
+                img_name = root + new_ext
+        if status == 206:
+            manifest.update(img_url_full, filename=img_name, status="partial")
+        else:
+            manifest.update(
+                img_url_full, filename=img_name, status="partial",
+                etag=response_headers.get("ETag"), last_modified=response_headers.get("Last-Modified")
+            )
+        return img_name
+
+    def _download_image(self, img_url, page_url, manifest, headers, control, retries=3, timeout=10):
+        import traceback
+        import requests
+        img_url_full, img_name, result = self._prepare_image(img_url, page_url, manifest, control)
+        if result is not None:
+            return result
+        img_path = os.path.join(manifest.folder, img_name)
+        last_exception = None
+        last_trace = None
+        for attempt in range(1, retries + 1):
+            # Early exit if stop requested
+            if self._is_stopped(control):
+                return False, None, None
+            try:
+                request_headers, part_path, offset = self._resume_request(manifest, img_url_full, img_path, headers)
+                with http_pool.get(img_url_full, headers=request_headers, timeout=timeout, stream=True) as img_data:
+                    # Check for permanent errors (404, 410)
+                    if img_data.status_code in (404, 410):
+                        return False, img_url_full, f"HTTP {img_data.status_code} (permanent error, not retried)"
+                    if img_data.status_code == 416 and offset:
+                        # Stale partial: start over without a Range header
+                        os.remove(part_path)
+                        continue
+                    img_data.raise_for_status()
+                    img_name = self._start_image_response(manifest, img_url_full, img_name, img_data.status_code, img_data.headers)
+                    img_path = os.path.join(manifest.folder, img_name)
+                    size = stream_to_file(img_data, img_path, append=img_data.status_code == 206, keep_partial=True)
+                self._finish_image(manifest, img_url_full, img_path, size)
+                return True, img_name, None
+            except requests.HTTPError as e:
+                # Permanent error: do not retry on 4xx except 408 (timeout)
+                if hasattr(e.response, 'status_code') and e.response is not None:
+                    code = e.response.status_code
+                    if code in (404, 410) or (400 <= code < 500 and code != 408):
+                        return False, img_url_full, f"HTTP {code} (permanent error, not retried)"
+                last_exception = e
+                last_trace = traceback.format_exc()
+            except (requests.ConnectionError, requests.Timeout) as e:
+                # Transient error: retry
+                last_exception = e
+                last_trace = traceback.format_exc()
+            except Exception as e:
+                last_exception = e
+                last_trace = traceback.format_exc()
+        return False, img_url_full, f"{last_exception}\n{last_trace}" if last_exception else None
+
+    async def _download_image_async(self, img_url, page_url, manifest, headers, control, retries=3, timeout=10):
+        """asyncio counterpart of _download_image, run on the AsyncHttpEngine loop.
+
+        Manifest updates, hashing and file I/O block, so they run on the image
+        worker pool; only the network transfer stays on the event loop.
+        """
+        import traceback
+        import asyncio
+        import aiohttp
+        loop = asyncio.get_running_loop()
+
+        def off_loop(fn, *args):
+            return loop.run_in_executor(self._image_executor, functools.partial(fn, *args))
+
+        img_url_full, img_name, result = await off_loop(self._prepare_image, img_url, page_url, manifest, control)
+        if result is not None:
+            return result
+        img_path = os.path.join(manifest.folder, img_name)
+        client_timeout = aiohttp.ClientTimeout(total=None, sock_connect=timeout, sock_read=timeout)
+        last_exception = None
+        last_trace = None
+        for attempt in range(1, retries + 1):
+            # Early exit if stop requested
+            if self._is_stopped(control):
+                return False, None, None
+            try:
+                request_headers, part_path, offset = await off_loop(self._resume_request, manifest, img_url_full, img_path, headers)
+                async with self._async_engine.get(img_url_full, headers=request_headers, timeout=client_timeout) as img_data:
+                    code = img_data.status
+                    if code == 416 and offset:
+                        # Stale partial: start over without a Range header
+                        await off_loop(os.remove, part_path)
+                        continue
+                    # Permanent error: do not retry on 4xx except 408 (timeout)
+                    if code in (404, 410) or (400 <= code < 500 and code != 408):
+                        return False, img_url_full, f"HTTP {code} (permanent error, not retried)"
+                    if code >= 400:
+                        last_exception = f"HTTP {code}"
+                        last_trace = ""
+                        continue
+                    img_name = await off_loop(self._start_image_response, manifest, img_url_full, img_name, code, img_data.headers)
+                    img_path = os.path.join(manifest.folder, img_name)
+                    part_path = img_path + ".part"
+                    f = await off_loop(open, part_path, "ab" if code == 206 else "wb")
+                    try:
+                        async for chunk in img_data.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                            await off_loop(f.write, chunk)
+                    finally:
+                        await off_loop(f.close)
+                await off_loop(self._complete_part, manifest, img_url_full, part_path, img_path)
+                return True, img_name, None
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                # Transient error: retry
+                last_exception = e
+                last_trace = traceback.format_exc()
+            except Exception as e:
+                last_exception = e
+                last_trace = traceback.format_exc()
+        return False, img_url_full, f"{last_exception}\n{last_trace}" if last_exception else None
+
+    def _complete_part(self, manifest, img_url_full, part_path, img_path):
+        size = os.path.getsize(part_path)
+        os.replace(part_path, img_path)
+        self._finish_image(manifest, img_url_full, img_path, size)
+
+    def _merge_images_to_pdf(self, folder):
+        def natural_key(s):
+            return [int(text) if text.isdigit() else text.lower() for text in re.split(r'(\d+)', os.path.basename(s))]
+        image_files = glob.glob(os.path.join(folder, '*'))
+        image_files = [f for f in image_files if f.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp', '.gif', '.webp'))]
+        image_files.sort(key=natural_key)
+        if not image_files:
+            self.log_signal.emit(f"[Auto-Merge] No images found in {folder}.")
+            return
+        pdf_path = os.path.join(folder, os.path.basename(folder) + '.pdf')
+        from concurrent.futures import ThreadPoolExecutor
+        from functools import partial
+        workers = os.cpu_count() or 1
+        encode = partial(encode_pdf_pages, jpeg_passthrough=self.jpeg_passthrough, transform=self.pdf_transform)
+        try:
+            # Single pass: each image is opened once (header only for JPEGs) and written once;
+            # the writer centres every page on the largest image size when it closes.
+            # Decoding/transforming runs on a small pool (PIL releases the GIL) while pages are written in order.
+            with ThreadPoolExecutor(max_workers=workers) as executor, \
+                    StreamingPDFWriter(pdf_path, uniform_page_size=True) as writer:
+                pages = ordered_parallel_map(executor, encode, image_files, workers * 2)
+                for img_path, future in zip(image_files, pages):
+                    try:
+                        for page in future.result():
+                            writer.add_jpeg(*page)
+                    except Exception as e:
+                        self.log_signal.emit(f"[Auto-Merge] Failed to process {img_path}: {e}")
+                if not writer.page_count:
+                    writer.abort()
+                    self.log_signal.emit(f"[Auto-Merge] No valid images to merge in {folder}.")
+                    return
+            self.log_signal.emit(f"[Auto-Merge] PDF created: {pdf_path}")
+        except Exception as e:
+            self.log_signal.emit(f"[Auto-Merge] Failed to create PDF in {folder}: {e}")
+
+class PDFMergeJob:
+    """Builds per-folder PDFs concurrently in a process pool."""
+    log_signal = JobSignal(str, str)  # message, level
+    progress_signal = JobSignal(int, int)
+    finished_signal = JobSignal(str)  # last PDF created ("" if none)
+
+    def __init__(self, folders, mode="Merge Images", jpeg_passthrough=True, max_workers=None, transform=None):
+        self.folders = folders
+        self.mode = mode
+        self.jpeg_passthrough = jpeg_passthrough
+        self.transform = transform
+        self.max_workers = max_workers
+
+    def run(self):
+        from concurrent.futures import as_completed
+        last_pdf = ""
+        done = 0
+        total = len(self.folders)
+        self.progress_signal.emit(0, total)
+        try:
+            with pdf_process_pool(self.max_workers) as executor:
+                if self.mode == "Merge PDFs":
+                    futures = {executor.submit(merge_folder_pdfs, folder): folder for folder in self.folders}
+                else:
+                    futures = {executor.submit(build_chapter_pdf, folder, self.jpeg_passthrough, self.transform): folder for folder in self.folders}
+                for future in as_completed(futures):
+                    try:
+                        pdf_path, messages = future.result()
+                    except Exception as e:
+                        pdf_path, messages = None, [("error", f"Failed to merge {futures[future]}: {e}")]
+                    for level, message in messages:
+                        self.log_signal.emit(message, level)
+                    if pdf_path:
+                        last_pdf = pdf_path
+                    done += 1
+                    self.progress_signal.emit(done, total)
+        except Exception as e:
+            self.log_signal.emit(f"PDF merge failed: {e}", "error")
+        self.finished_signal.emit(last_pdf)
+
+class VolumePDFJob:
+    log_signal = JobSignal(str)
+    progress_signal = JobSignal(int, int)
+    finished_signal = JobSignal()
+
+    def __init__(self, subfolders, pdf_path, jpeg_passthrough=True, max_workers=None, concat_pdfs=False, transform=None):
+        self.subfolders = subfolders
+        self.pdf_path = pdf_path
+        self.jpeg_passthrough = jpeg_passthrough
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.concat_pdfs = concat_pdfs
+        self.transform = transform
+        # True once the volume PDF exists and is current; front ends use it for their exit status
+        self.succeeded = False
+
+    def run(self):
+        if self.concat_pdfs:
+            self._concat_chapter_pdfs()
+            self.finished_signal.emit()
+            return
+        from functools import partial
+        chapters = []
+        for folder in sorted(self.subfolders):
+            files = sorted(glob.glob(os.path.join(folder, '*')))
+            chapters.append((folder, [f for f in files if f.lower().endswith(IMAGE_EXTENSIONS)]))
+        # Pages from different encode settings must not be mixed in one volume
+        options = {"jpeg_passthrough": self.jpeg_passthrough, "transform": vars(self.transform) if self.transform else None}
+        index = VolumeIndex(self.pdf_path)
+        reused = index.reusable_chapters(chapters, options)
+        if reused:
+            append_state = index.writer_state
+            chapters = chapters[reused:]
+            if not chapters:
+                self.succeeded = True
+                self.log_signal.emit(f"Volume PDF is already up to date: {self.pdf_path}")
+                self.finished_signal.emit()
+                return
+            self.log_signal.emit(f"Appending {len(chapters)} new chapter(s) to {self.pdf_path} ({reused} unchanged).")
+        else:
+            append_state = None
+            index.reset()
+        image_files = [f for _, files in chapters for f in files]
+        total = len(image_files)
+        # Pages are encoded in worker processes but written in order, one at a time,
+        # so memory stays flat for any volume size
+        try:
+            encode = partial(encode_pdf_pages, jpeg_passthrough=self.jpeg_passthrough, transform=self.transform)
+            with pdf_process_pool(self.max_workers) as executor, \
+                    StreamingPDFWriter(self.pdf_path, append_state=append_state) as writer:
+                pages = ordered_parallel_map(executor, encode, image_files, self.max_workers * 2)
+                done = 0
+                for folder, files in chapters:
+                    first_page = writer.page_count
+                    writer.add_bookmark(os.path.basename(folder))
+                    for img_path, future in zip(files, pages):
+                        done += 1
+                        try:
+                            for page in future.result():
+                                writer.add_jpeg(*page)
+                        except Exception as e:
+                            self.log_signal.emit(f"Failed to open {img_path}: {e}")
+                        if done % 20 == 0 or done == total:
+                            self.progress_signal.emit(done, total)
+                    index.add_chapter(folder, files, first_page, writer.page_count - first_page)
+                page_count = writer.page_count
+                if not page_count:
+                    writer.abort()
+            if page_count:
+                index.save(writer.state, options)
+                self.succeeded = True
+                self.log_signal.emit(f"Volume PDF created: {self.pdf_path}")
+            else:
+                self.log_signal.emit("No valid images to merge for volume.")
+        except Exception as e:
+            self.log_signal.emit(f"Failed to create volume PDF: {e}")
+        self.finished_signal.emit()
+
+    def _concat_chapter_pdfs(self):
+        """Build the volume from each chapter's existing PDF, copying page objects as-is.
+
+        Chapters without a PDF yet get one built from their images first.
+        """
+        pypdf = load_pypdf()
+        if pypdf is None:
+            self.log_signal.emit(f"Failed to create volume PDF: {PYPDF_MISSING}")
+            return
+        writer = pypdf.PdfWriter()
+        folders = sorted(self.subfolders)
+        for done, folder in enumerate(folders, 1):
+            name = os.path.basename(folder)
+            chapter_pdf = os.path.join(folder, name + '.pdf')
+            if not os.path.isfile(chapter_pdf):
+                chapter_pdf, messages = build_chapter_pdf(folder, self.jpeg_passthrough, self.transform)
+                for _, msg in messages:
+                    self.log_signal.emit(msg)
+            if chapter_pdf:
+                try:
+                    reader = pypdf.PdfReader(chapter_pdf)
+                    first_page = len(writer.pages)
+                    for page in reader.pages:
+                        writer.add_page(page)
+                    if len(writer.pages) > first_page:
+                        _pdf_add_outline(writer, name, first_page)
+                except Exception as e:
+                    self.log_signal.emit(f"Failed to read {chapter_pdf}: {e}")
+            self.progress_signal.emit(done, len(folders))
+        if not writer.pages:
+            self.log_signal.emit("No chapter PDFs to merge for volume.")
+            return
+        tmp_path = self.pdf_path + ".tmp"
+        try:
+            _pdf_open_outlines(writer)
+            with open(tmp_path, "wb") as f:
+                writer.write(f)
+            os.replace(tmp_path, self.pdf_path)
+            # The page layout no longer matches any incremental index from an image build
+            try:
+                os.remove(self.pdf_path + VolumeIndex.SUFFIX)
+            except OSError:
+                pass
+            self.succeeded = True
+            self.log_signal.emit(f"Volume PDF created: {self.pdf_path}")
+        except Exception as e:
+            self.log_signal.emit(f"Failed to create volume PDF: {e}")
@@ -1,66 +1,309 @@
 import os
+import re
 import sys
 import json
-import importlib.util
-import requests
 import collections
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urlparse
 from pathlib import Path
 
 
 from PySide6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton, QTextEdit, QLabel,
     QFileDialog, QCheckBox, QProgressBar, QSpinBox, QTabWidget, QMessageBox, QMenuBar, QMenu,
-    QListWidget, QListWidgetItem, QComboBox, QGroupBox, QSpacerItem, QSizePolicy, QDialog
+    QListWidget, QListWidgetItem, QComboBox, QGroupBox, QSpacerItem, QSizePolicy, QDialog, QTableView,
+    QAbstractItemView, QHeaderView, QListView, QStyledItemDelegate, QStyleOptionViewItem,
+    QStyleOptionProgressBar, QStyle
 )
-from PySide6.QtCore import Qt, QThread, Signal
-from PySide6.QtGui import QAction, QIcon
+from PySide6.QtCore import Qt, QThread, Signal, QObject, QAbstractListModel, QModelIndex, QTimer, QRect, QSize
+from PySide6.QtGui import QAction, QIcon, QColor
 
 QTextEditClass = QTextEdit
 pyqtSignal = Signal
 
-from PIL import Image
-import glob
-# PDF editing import (pypdf or PyPDF2)
-try:
-    import pypdf
-except ImportError:
-    try:
-        import PyPDF2 as pypdf
-    except ImportError:
-        pypdf = None
-# Selenium imports
-try:
-    from selenium import webdriver
-    from selenium.webdriver.common.by import By
-    from selenium.webdriver.chrome.options import Options as ChromeOptions
-except ImportError:
-    webdriver = None
-    By = None
-    ChromeOptions = None
-
-def load_plugins():
-    plugins = []
-    plugins_dir = os.path.join(os.path.dirname(__file__), "plugins")
-    if not os.path.isdir(plugins_dir):
-        return plugins
-    import inspect
-    for fname in os.listdir(plugins_dir):
-        if fname.endswith("_plugin.py"):
-            path = os.path.join(plugins_dir, fname)
-            spec = importlib.util.spec_from_file_location(fname[:-3], path)
-            mod = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(mod)
-            for obj in mod.__dict__.values():
-                if inspect.isclass(obj) and hasattr(obj, "can_handle") and hasattr(obj, "get_image_urls"):
-                    # Skip abstract base classes
-                    if getattr(obj, "__abstractmethods__", None):
-                        continue
-                    plugins.append(obj())
-    return plugins
+# Download/merge engines live in manga_core so they can also run headless (see manga_cli.py)
+from manga_core import (
+    DownloadJob, JobSignal, JobStore, PDF_JPEG_QUALITY, PDFMergeJob, PageTransform, VolumePDFJob,
+    http_pool, load_plugins, load_pypdf, load_selenium, page_cache,
+)
+
+LOG_COLORS = {"info": "#222", "success": "#228B22", "warning": "#FF8C00", "error": "#B22222"}
+# Log filter combo entry -> levels shown (None = all)
+LOG_FILTERS = {"All": None, "Info/Success": ("info", "success"), "Warning": ("warning",), "Error": ("error",)}
+LOG_MAX_ENTRIES = 100000
+LOG_FLUSH_INTERVAL_MS = 50  # batched log flushes, ~20 per second
+SETTINGS_FLUSH_DELAY_MS = 500  # debounce for settings writes
+QUEUE_STATUS_COLORS = {"Completed": "#006400", "Failed": "#B22222", "Incomplete": "#FF8C00", "Downloading": "#0000CD", "Skipped": "#B8860B"}
+
+
+def _format_bytes(count):
+    for unit in ("B", "KB", "MB", "GB"):
+        if count < 1024 or unit == "GB":
+            return f"{count:.0f} {unit}" if unit == "B" else f"{count:.1f} {unit}"
+        count /= 1024
+
+
+class LogModel(QAbstractListModel):
+    """Append-only log for the status view.
+
+    Entries are ``(level, text)`` rows with a row index per level, so
+    switching the filter costs O(matching rows) and appending costs O(1);
+    the view only renders the rows on screen. When the log exceeds
+    ``max_entries`` the oldest quarter is dropped in one go.
+    """
+
+    def __init__(self, max_entries=LOG_MAX_ENTRIES, parent=None):
+        super().__init__(parent)
+        self.max_entries = max_entries
+        self._entries = []
+        self._by_level = collections.defaultdict(list)
+        self._levels = None  # None = unfiltered
+        self._visible = None  # row numbers shown when filtered
+        self._brushes = {level: QColor(color) for level, color in LOG_COLORS.items()}
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._entries) if self._visible is None else len(self._visible)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row() if self._visible is None else self._visible[index.row()]
+        level, text = self._entries[row]
+        if role in (Qt.DisplayRole, Qt.ToolTipRole):
+            return text
+        if role == Qt.ForegroundRole:
+            return self._brushes.get(level, self._brushes["info"])
+        return None
+
+    def set_filter(self, levels):
+        self.beginResetModel()
+        self._levels = levels
+        if levels is None:
+            self._visible = None
+        else:
+            import heapq
+            self._visible = list(heapq.merge(*(self._by_level[level] for level in levels)))
+        self.endResetModel()
+
+    def append(self, entries):
+        """Append a batch of ``(level, text)`` rows with a single insert notification."""
+        start = len(self._entries)
+        shown = []
+        for offset, (level, text) in enumerate(entries):
+            self._by_level[level].append(start + offset)
+            if self._levels is None or level in self._levels:
+                shown.append(start + offset)
+        first = start if self._visible is None else len(self._visible)
+        if shown:
+            self.beginInsertRows(QModelIndex(), first, first + len(shown) - 1)
+        self._entries.extend(entries)
+        if self._visible is not None:
+            self._visible.extend(shown)
+        if shown:
+            self.endInsertRows()
+        if len(self._entries) > self.max_entries:
+            self._trim()
+
+    def _trim(self):
+        keep = self.max_entries * 3 // 4
+        self.beginResetModel()
+        self._entries = self._entries[-keep:] if keep else []
+        self._by_level = collections.defaultdict(list)
+        for row, (level, _) in enumerate(self._entries):
+            self._by_level[level].append(row)
+        if self._levels is not None:
+            self._visible = [row for row, (level, _) in enumerate(self._entries) if level in self._levels]
+        self.endResetModel()
+
+    def clear(self):
+        self.beginResetModel()
+        self._entries = []
+        self._by_level = collections.defaultdict(list)
+        if self._visible is not None:
+            self._visible = []
+        self.endResetModel()
+
+    def entries(self, visible_only=False):
+        if visible_only and self._visible is not None:
+            return [self._entries[row] for row in self._visible]
+        return list(self._entries)
+
+
+class Settings(QObject):
+    """User settings, read once and kept in memory.
+
+    ``set`` only marks the key dirty and (re)starts a short single-shot
+    timer; ``flush`` then writes the file to a temporary name and renames it
+    over the original, so readers never see a torn file. Keys changed here
+    are merged into the file's current contents, leaving keys written by
+    another running instance alone.
+    """
+
+    def __init__(self, path, parent=None):
+        super().__init__(parent)
+        self.path = Path(path)
+        self._data = self._read()
+        self._dirty = set()
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(SETTINGS_FLUSH_DELAY_MS)
+        self._flush_timer.timeout.connect(self.flush)
+
+    def _read(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
 
+    def get(self, key, default=None):
+        return self._data.get(key, default)
 
+    def __contains__(self, key):
+        return key in self._data
+
+    def set(self, key, value):
+        if key in self._data and self._data[key] == value:
+            return
+        self._data[key] = value
+        self._dirty.add(key)
+        self._flush_timer.start()
+
+    def flush(self):
+        self._flush_timer.stop()
+        if not self._dirty:
+            return
+        data = self._read()
+        data.update((key, self._data[key]) for key in self._dirty)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except OSError:
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+            return
+        self._dirty.clear()
+
+
+class QueueModel(QAbstractListModel):
+    """Download queue rows ``[url, status, done, total]`` with a URL -> row index.
+
+    Lookups by URL are O(1) and status/progress updates only repaint the
+    affected row, so the view stays responsive with tens of thousands of URLs.
+    """
+    UrlRole = Qt.UserRole
+    StatusRole = Qt.UserRole + 1
+    ProgressRole = Qt.UserRole + 2
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+        self._index = {}  # url -> row
+        self._brushes = {status: QColor(color) for status, color in QUEUE_STATUS_COLORS.items()}
+        self._default_brush = QColor("black")
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        url, status, done, total = self._rows[index.row()]
+        if role == Qt.DisplayRole:
+            return f"{status}: {url}"
+        if role in (Qt.ToolTipRole, self.UrlRole):
+            return url
+        if role == self.StatusRole:
+            return status
+        if role == self.ProgressRole:
+            return done, total
+        if role == Qt.ForegroundRole:
+            return self._brushes.get(status, self._default_brush)
+        return None
+
+    def __contains__(self, url):
+        return url in self._index
+
+    def __len__(self):
+        return len(self._rows)
+
+    def reset(self, entries):
+        """Replace the queue with ``(url, status[, done, total])`` rows, keeping the first of any duplicate URL."""
+        self.beginResetModel()
+        self._rows = []
+        self._index = {}
+        for url, status, *progress in entries:
+            if url not in self._index:
+                self._index[url] = len(self._rows)
+                self._rows.append([url, status, *(progress or (0, 0))])
+        self.endResetModel()
+
+    def status(self, url):
+        row = self._index.get(url)
+        return None if row is None else self._rows[row][1]
+
+    def items(self):
+        """``(url, status)`` pairs in queue order."""
+        return [(url, status) for url, status, _, _ in self._rows]
+
+    def set_status(self, url, status):
+        row = self._index.get(url)
+        if row is not None and self._rows[row][1] != status:
+            self._rows[row][1] = status
+            self._changed(row)
+
+    def set_progress(self, url, done, total):
+        row = self._index.get(url)
+        if row is not None:
+            self._rows[row][2:] = [done, total]
+            self._changed(row)
+
+    def remove(self, url):
+        row = self._index.pop(url, None)
+        if row is None:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._rows[row]
+        for later in self._rows[row:]:
+            self._index[later[0]] -= 1
+        self.endRemoveRows()
+
+    def _changed(self, row):
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+
+
+class QueueDelegate(QStyledItemDelegate):
+    """Paints a queue row as its status text plus a progress bar on the right."""
+    BAR_WIDTH = 120
+
+    def paint(self, painter, option, index):
+        text_option = QStyleOptionViewItem(option)
+        text_option.rect = option.rect.adjusted(0, 0, -(self.BAR_WIDTH + 6), 0)
+        super().paint(painter, text_option, index)
+        done, total = index.data(QueueModel.ProgressRole)
+        bar = QStyleOptionProgressBar()
+        bar.rect = QRect(option.rect.right() - self.BAR_WIDTH, option.rect.top() + 2, self.BAR_WIDTH, option.rect.height() - 4)
+        bar.state = option.state | QStyle.State_Enabled
+        bar.minimum = 0
+        bar.maximum = max(total, 1)
+        bar.progress = done
+        bar.textVisible = True
+        bar.text = f"{done * 100 // total}%" if total else "0%"
+        style = option.widget.style() if option.widget else QApplication.style()
+        style.drawControl(QStyle.CE_ProgressBar, bar, painter, option.widget)
+
+    def sizeHint(self, option, index):
+        size = super().sizeHint(option, index)
+        return QSize(size.width() + self.BAR_WIDTH + 6, max(size.height(), 22))
 
 
 class MangaDownloader(QWidget):
@@ -73,10 +316,11 @@ class MangaDownloader(QWidget):
         super().__init__()
         self.setWindowTitle("Manga Image Downloader")
         self.setGeometry(100, 100, 500, 350)
+        self.settings = Settings(self._get_settings_path(), self)
+        self._import_legacy_save_location()
         self.plugins = load_plugins()
-        self.restore_queue_state()
-        # Connect DownloadThread selenium error signal to dialog
-        self._connect_selenium_error_signal = False
+        self.job_store = JobStore(self._get_job_store_path())
+        self.download_thread = None
     # ...existing code...
 
         # Main tab widget
@@ -126,9 +370,18 @@ class MangaDownloader(QWidget):
         layout.addLayout(url_input_layout)
 
         # Download queue list
-        self.queue_list = QListWidget()
+        self.queue_model = QueueModel(self)
+        self.queue_list = QListView()
+        self.queue_list.setModel(self.queue_model)
+        self.queue_list.setItemDelegate(QueueDelegate(self.queue_list))
+        self.queue_list.setUniformItemSizes(True)
         self.queue_list.setMinimumHeight(120)
-        self.queue_list.setToolTip("Shows the status of each URL in the download queue. Double-click a failed item to retry.")
+        self.queue_list.setToolTip("Shows the status of each URL in the download queue. Double-click a failed or incomplete item to retry.")
+        # Double-click to retry failed
+        self.queue_list.doubleClicked.connect(self.retry_failed_download)
+        # Right-click context menu for pause/resume
+        self.queue_list.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.queue_list.customContextMenuRequested.connect(self.show_queue_context_menu)
         layout.addWidget(self.queue_list)
 
         # Log filter and log buttons layout
@@ -178,7 +431,8 @@ class MangaDownloader(QWidget):
         # Merge mode dropdown
         self.merge_mode_combo = QComboBox()
         self.merge_mode_combo.addItems(["Merge Images", "Merge PDFs"])
-        self.merge_mode_combo.setToolTip("Select merge mode: merge images or merge PDFs in subfolders")
+        self.merge_mode_combo.setToolTip("Select merge mode: merge images or merge PDFs in subfolders.\n"
+                                         "For volumes, \"Merge PDFs\" joins each chapter's existing PDF without re-encoding images")
         pdf_actions_layout.addWidget(self.merge_mode_combo)
 
         # Open PDF button (hidden by default)
@@ -225,6 +479,11 @@ class MangaDownloader(QWidget):
         self.pdf_status_box.setMaximumHeight(80)
         self.pdf_status_box.setToolTip("PDF operation status and feedback messages")
         pdf_layout.addWidget(self.pdf_status_box)
+        # PDF progress bar (per folder for merges, per page for volumes)
+        self.pdf_progress_bar = QProgressBar()
+        self.pdf_progress_bar.setValue(0)
+        self.pdf_progress_bar.setVisible(False)
+        pdf_layout.addWidget(self.pdf_progress_bar)
         pdf_layout.addItem(QSpacerItem(20, 20, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Expanding))
 
         self.pdf_tab.setLayout(pdf_layout)
@@ -234,12 +493,31 @@ class MangaDownloader(QWidget):
         self.download_button.setToolTip("Start downloading images from the listed URLs")
         self.download_button.clicked.connect(self.download_images)
         layout.addWidget(self.download_button)
+        self.resume_unfinished_button = QPushButton("Resume Unfinished")
+        self.resume_unfinished_button.setToolTip("Download the queued, interrupted, failed or incomplete chapters left from earlier runs")
+        self.resume_unfinished_button.clicked.connect(self.resume_unfinished_downloads)
+        layout.addWidget(self.resume_unfinished_button)
 
         # (Global Pause/Resume buttons removed)
 
-        # Status box
-        self.status_box = QTextEdit()
-        self.status_box.setReadOnly(True)
+        # Status box: a virtualised view over the log model, fed in batches by a timer
+        self.log_model = LogModel(parent=self)
+        self._pending_logs = []
+        self._log_flush_timer = QTimer(self)
+        self._log_flush_timer.setInterval(LOG_FLUSH_INTERVAL_MS)
+        self._log_flush_timer.timeout.connect(self.flush_log)
+        # A one-column table with fixed row heights never lays out off-screen rows
+        self.status_box = QTableView()
+        self.status_box.setModel(self.log_model)
+        self.status_box.horizontalHeader().hide()
+        self.status_box.horizontalHeader().setStretchLastSection(True)
+        self.status_box.verticalHeader().hide()
+        self.status_box.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.status_box.verticalHeader().setDefaultSectionSize(self.status_box.fontMetrics().height() + 4)
+        self.status_box.setShowGrid(False)
+        self.status_box.setWordWrap(False)
+        self.status_box.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.status_box.setSelectionMode(QAbstractItemView.ExtendedSelection)
         self.status_box.setToolTip("Status messages, errors, and progress will appear here")
         layout.addWidget(self.status_box)
 
@@ -250,6 +528,7 @@ class MangaDownloader(QWidget):
         layout.addWidget(self.progress_bar)
 
         self.downloader_tab.setLayout(layout)
+        self.restore_queue_state()
         # Save queue state on close
         self._orig_closeEvent = self.closeEvent
         self.closeEvent = self._on_close_event
@@ -264,13 +543,100 @@ class MangaDownloader(QWidget):
         self.concurrency_spin.setMinimum(1)
         self.concurrency_spin.setMaximum(32)
         self.concurrency_spin.setValue(6)
-        self.concurrency_spin.setToolTip("Number of images to download at the same time")
+        self.concurrency_spin.setToolTip("Number of images to download at the same time (shared by all chapters)")
         concurrency_layout.addWidget(self.concurrency_spin)
         settings_layout.addLayout(concurrency_layout)
+        # Chapter parallelism
+        chapter_concurrency_layout = QHBoxLayout()
+        chapter_concurrency_label = QLabel("Chapters in parallel:")
+        chapter_concurrency_layout.addWidget(chapter_concurrency_label)
+        self.chapter_concurrency_spin = QSpinBox()
+        self.chapter_concurrency_spin.setMinimum(1)
+        self.chapter_concurrency_spin.setMaximum(8)
+        self.chapter_concurrency_spin.setValue(2)
+        self.chapter_concurrency_spin.setToolTip("Number of chapter pages to process at the same time (each may use its own browser)")
+        chapter_concurrency_layout.addWidget(self.chapter_concurrency_spin)
+        settings_layout.addLayout(chapter_concurrency_layout)
+        # Per-host connection pool and rate limit
+        host_limits_layout = QHBoxLayout()
+        host_limits_layout.addWidget(QLabel("Connections per host:"))
+        self.host_pool_spin = QSpinBox()
+        self.host_pool_spin.setMinimum(1)
+        self.host_pool_spin.setMaximum(64)
+        self.host_pool_spin.setValue(http_pool.pool_size)
+        self.host_pool_spin.setToolTip("Keep-alive connections reused per site/CDN across all chapters")
+        host_limits_layout.addWidget(self.host_pool_spin)
+        host_limits_layout.addWidget(QLabel("Requests/sec per host:"))
+        self.host_rate_spin = QSpinBox()
+        self.host_rate_spin.setMinimum(0)
+        self.host_rate_spin.setMaximum(100)
+        self.host_rate_spin.setValue(int(http_pool.rate))
+        self.host_rate_spin.setToolTip("Maximum requests per second sent to one host (0 = unlimited, the default). Set a limit for sites that block fast downloads.")
+        host_limits_layout.addWidget(self.host_rate_spin)
+        settings_layout.addLayout(host_limits_layout)
+        # Chapter page cache
+        page_cache_layout = QHBoxLayout()
+        page_cache_layout.addWidget(QLabel("Page cache size (MB):"))
+        self.page_cache_spin = QSpinBox()
+        self.page_cache_spin.setMinimum(0)
+        self.page_cache_spin.setMaximum(10000)
+        self.page_cache_spin.setValue(page_cache.max_bytes // (1024 * 1024))
+        self.page_cache_spin.setToolTip("Disk space for cached chapter pages revalidated with ETag/Last-Modified (0 = disabled)")
+        page_cache_layout.addWidget(self.page_cache_spin)
+        settings_layout.addLayout(page_cache_layout)
+        # Download engine
+        engine_layout = QHBoxLayout()
+        engine_layout.addWidget(QLabel("Download engine:"))
+        self.engine_combo = QComboBox()
+        self.engine_combo.addItems(["Threads", "asyncio (aiohttp)"])
+        self.engine_combo.setToolTip("asyncio runs every chapter's image fetches in one event loop; requires aiohttp")
+        engine_layout.addWidget(self.engine_combo)
+        engine_layout.addWidget(QLabel("Async in-flight requests:"))
+        self.async_in_flight_spin = QSpinBox()
+        self.async_in_flight_spin.setMinimum(1)
+        self.async_in_flight_spin.setMaximum(5000)
+        self.async_in_flight_spin.setValue(256)
+        self.async_in_flight_spin.setToolTip("Maximum concurrent image requests in asyncio mode (per-host limits still apply)")
+        engine_layout.addWidget(self.async_in_flight_spin)
+        settings_layout.addLayout(engine_layout)
+        # Cross-chapter deduplication
+        self.dedupe_checkbox = QCheckBox("Store identical images once (hardlink into chapter folders)")
+        self.dedupe_checkbox.setChecked(True)
+        self.dedupe_checkbox.setToolTip("Keep one copy of repeated credit/banner images in a hidden .blobs folder and skip refetching URLs already downloaded")
+        settings_layout.addWidget(self.dedupe_checkbox)
         # Auto-merge
         self.auto_merge_checkbox = QCheckBox("Auto-merge images to PDF after download")
         self.auto_merge_checkbox.setToolTip("Automatically merge downloaded images into a PDF after each chapter")
         settings_layout.addWidget(self.auto_merge_checkbox)
+        # Lossless JPEG pages
+        self.jpeg_passthrough_checkbox = QCheckBox("Embed JPEG images in PDFs without re-encoding")
+        self.jpeg_passthrough_checkbox.setChecked(True)
+        self.jpeg_passthrough_checkbox.setToolTip("Copy JPEG files into PDFs byte-for-byte (faster, no quality loss); other formats are converted")
+        settings_layout.addWidget(self.jpeg_passthrough_checkbox)
+        # Page downscale/recompress for PDF output
+        pdf_transform_layout = QHBoxLayout()
+        pdf_transform_layout.addWidget(QLabel("PDF max page width (px):"))
+        self.pdf_max_width_spin = QSpinBox()
+        self.pdf_max_width_spin.setMinimum(0)
+        self.pdf_max_width_spin.setMaximum(10000)
+        self.pdf_max_width_spin.setSingleStep(100)
+        self.pdf_max_width_spin.setValue(0)
+        self.pdf_max_width_spin.setToolTip("Shrink wider pages to this width before adding them to PDFs (0 = keep original size)")
+        pdf_transform_layout.addWidget(self.pdf_max_width_spin)
+        pdf_transform_layout.addWidget(QLabel("JPEG quality:"))
+        self.pdf_quality_spin = QSpinBox()
+        self.pdf_quality_spin.setMinimum(10)
+        self.pdf_quality_spin.setMaximum(100)
+        self.pdf_quality_spin.setValue(PDF_JPEG_QUALITY)
+        self.pdf_quality_spin.setToolTip("Quality for pages that are re-encoded (resized, greyscaled, or not JPEG, e.g. WebP/PNG)")
+        pdf_transform_layout.addWidget(self.pdf_quality_spin)
+        self.pdf_grayscale_checkbox = QCheckBox("Grayscale")
+        self.pdf_grayscale_checkbox.setToolTip("Store PDF pages in grayscale (much smaller for black-and-white manga)")
+        pdf_transform_layout.addWidget(self.pdf_grayscale_checkbox)
+        self.pdf_split_strips_checkbox = QCheckBox("Split long strips")
+        self.pdf_split_strips_checkbox.setToolTip("Cut tall webtoon strips into reader-sized PDF pages at blank gutters between panels")
+        pdf_transform_layout.addWidget(self.pdf_split_strips_checkbox)
+        settings_layout.addLayout(pdf_transform_layout)
         # Dependency warning/info label
         self.dependency_warning_label = QLabel()
         self.dependency_warning_label.setWordWrap(True)
@@ -288,6 +654,16 @@ class MangaDownloader(QWidget):
         self.headless_checkbox.setChecked(True)
         self.headless_checkbox.setToolTip("Run Selenium in headless mode (no visible browser window). Uncheck to see the browser.")
         settings_layout.addWidget(self.headless_checkbox)
+        # Lazy-load wait ceiling
+        lazy_load_layout = QHBoxLayout()
+        lazy_load_layout.addWidget(QLabel("Max lazy-load wait per page (s):"))
+        self.lazy_load_spin = QSpinBox()
+        self.lazy_load_spin.setMinimum(1)
+        self.lazy_load_spin.setMaximum(120)
+        self.lazy_load_spin.setValue(15)
+        self.lazy_load_spin.setToolTip("Upper bound for scrolling a browser-loaded page; extraction continues as soon as its images stop changing")
+        lazy_load_layout.addWidget(self.lazy_load_spin)
+        settings_layout.addLayout(lazy_load_layout)
         # Selenium driver path
         selenium_driver_layout = QHBoxLayout()
         self.selenium_driver_path_field = QLineEdit()
@@ -345,30 +721,10 @@ class MangaDownloader(QWidget):
         return home / ".manga_downloader_settings.json"
 
     def save_settings(self, key, value):
-        try:
-            path = self._get_settings_path()
-            if path.exists():
-                with open(path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-            else:
-                data = {}
-            data[key] = value
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(data, f)
-        except Exception:
-            pass
+        self.settings.set(key, value)
 
     def load_settings(self, key, default=None):
-        try:
-            path = self._get_settings_path()
-            if path.exists():
-                with open(path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                return data.get(key, default)
-            else:
-                return default
-        except Exception:
-            return default
+        return self.settings.get(key, default)
 
     def browse_selenium_driver(self):
         path, _ = QFileDialog.getOpenFileName(self, "Select Selenium WebDriver Executable", "", "Executable Files (*.exe);;All Files (*)")
@@ -461,30 +817,31 @@ class MangaDownloader(QWidget):
         else:
             self.log("No PDF available to open.")
 
-    def _get_save_location_path(self):
-        # Store in user home directory for cross-platform consistency
+    def _get_legacy_save_location_path(self):
         home = Path.home()
         return home / ".manga_downloader_last_save_location.json"
 
-    def save_last_save_location(self, folder):
+    def _import_legacy_save_location(self):
+        # Older versions kept the last save location in a file of its own
+        path = self._get_legacy_save_location_path()
+        if not path.exists():
+            return
         try:
-            path = self._get_save_location_path()
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump({"last_folder": folder}, f)
-        except Exception:
+            with open(path, "r", encoding="utf-8") as f:
+                folder = json.load(f).get("last_folder")
+            if folder and "last_folder" not in self.settings:
+                self.settings.set("last_folder", folder)
+                self.settings.flush()
+            path.unlink()
+        except (OSError, ValueError, AttributeError):
             pass
 
+    def save_last_save_location(self, folder):
+        self.settings.set("last_folder", folder)
+
     def load_last_save_location(self):
-        try:
-            path = self._get_save_location_path()
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                return data.get("last_folder", str(Path.cwd() / "manga_images"))
-        except Exception:
-            return str(Path.cwd() / "manga_images")
+        return self.settings.get("last_folder", str(Path.cwd() / "manga_images"))
 
-    
-    
     def show_about_dialog(self):
         about_text = (
             "<b>Manga Image Downloader</b><br><br>"
@@ -522,16 +879,17 @@ class MangaDownloader(QWidget):
         QMessageBox.about(self, "About Manga Image Downloader", about_text)
 
     def clear_log(self):
-        self.status_box.clear()
-        self._log_history = []
+        self._pending_logs = []
+        self.log_model.clear()
 
     def save_log_to_file(self):
         from PySide6.QtWidgets import QFileDialog
         path, _ = QFileDialog.getSaveFileName(self, "Save Log As", "log.txt", "Text Files (*.txt);;All Files (*)")
         if path:
+            self.flush_log()
             with open(path, "w", encoding="utf-8") as f:
-                for entry in getattr(self, '_log_history', []):
-                    f.write(f"[{entry['level'].upper()}] {entry['plain']}\n")
+                for level, text in self.log_model.entries():
+                    f.write(f"[{level.upper()}] {text}\n")
 
     def copy_urls_to_clipboard(self):
         clipboard = QApplication.clipboard()
@@ -540,12 +898,9 @@ class MangaDownloader(QWidget):
 
     def copy_log_to_clipboard(self):
         clipboard = QApplication.clipboard()
-        # Remove HTML tags for plain text copy
-        import re
-        html = self.status_box.toHtml()
-        # Extract text from HTML
-        text = re.sub('<[^<]+?>', '', html)
-        clipboard.setText(text.strip())
+        # Copy what the current filter shows
+        self.flush_log()
+        clipboard.setText("\n".join(text for _, text in self.log_model.entries(visible_only=True)))
 
     def clear_urls(self):
         self.url_input.clear()
@@ -588,6 +943,7 @@ class MangaDownloader(QWidget):
             self.dependency_warning_label.setStyleSheet("color: #B22222; font-weight: bold;")
             self.dependency_warning_label.setVisible(True)
             return
+        webdriver, _, ChromeOptions = load_selenium()
         if webdriver is None or ChromeOptions is None:
             self.log_error("Selenium or Chrome WebDriver is not installed. Please install selenium and try again.")
             self.dependency_warning_label.setText("Selenium or Chrome WebDriver is not installed. Please install selenium and try again.")
@@ -669,10 +1025,11 @@ class MangaDownloader(QWidget):
         # Check for pdf2image
         pdf2image_ok = False
         pdf2image_msg = ""
-        try:
-            import pdf2image
+        # find_spec only locates the package; importing it here would pull Pillow into start-up
+        import importlib.util
+        if importlib.util.find_spec("pdf2image") is not None:
             pdf2image_ok = True
-        except ImportError:
+        else:
             pdf2image_msg = "pdf2image Python package not found. PDF preview and some PDF features may not work. Install with: pip install pdf2image\n"
         # Compose warning/instruction message
         msg = ""
@@ -696,42 +1053,28 @@ class MangaDownloader(QWidget):
         self.dependency_warning_label.setVisible(bool(msg))
 
     def log(self, message, level="info"):
-        color = {
-            "info": "#222",
-            "success": "#228B22",
-            "warning": "#FF8C00",
-            "error": "#B22222"
-        }.get(level, "#222")
-        html = f'<span style="color:{color}">{message}</span>'
-        # Store log history for filtering and saving (limit to 1000 entries)
-        if not hasattr(self, '_log_history'):
-            self._log_history = []
-        import re
+        # Queued and flushed in batches: per-image messages must not cost a repaint each
         plain = re.sub('<[^<]+?>', '', str(message))
-        self._log_history.append({"level": level, "html": html, "plain": plain})
-        max_log_entries = 1000
-        if len(self._log_history) > max_log_entries:
-            self._log_history = self._log_history[-max_log_entries:]
-        self.apply_log_filter()
+        self._pending_logs.extend((level, line) for line in plain.splitlines() if line.strip())
+        if not self._log_flush_timer.isActive():
+            self._log_flush_timer.start()
+
+    def flush_log(self):
+        if not self._pending_logs:
+            self._log_flush_timer.stop()
+            return
+        batch, self._pending_logs = self._pending_logs, []
+        scrollbar = self.status_box.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum()
+        self.log_model.append(batch)
+        if at_bottom:
+            self.status_box.scrollToBottom()
 
     def apply_log_filter(self):
-        if not hasattr(self, '_log_history'):
-            self._log_history = []
         filter_mode = self.log_filter_combo.currentText() if hasattr(self, 'log_filter_combo') else "All"
-        self.status_box.clear()
-        for entry in self._log_history:
-            show = False
-            if filter_mode == "All":
-                show = True
-            elif filter_mode == "Info/Success":
-                show = entry["level"] in ("info", "success")
-            elif filter_mode == "Warning":
-                show = entry["level"] == "warning"
-            elif filter_mode == "Error":
-                show = entry["level"] == "error"
-            if show:
-                self.status_box.append(entry["html"])
-        self.status_box.verticalScrollBar().setValue(self.status_box.verticalScrollBar().maximum())
+        self.flush_log()
+        self.log_model.set_filter(LOG_FILTERS.get(filter_mode))
+        self.status_box.scrollToBottom()
 
     def log_error(self, message):
         self.log(message, level="error")
@@ -763,97 +1106,83 @@ class MangaDownloader(QWidget):
             self.log("Please select a save location.")
             return
         output_folder.mkdir(parents=True, exist_ok=True)
-        auto_merge = self.auto_merge_checkbox.isChecked()
         # Always log number of images found (no setting)
+        self._show_download_started()
+        # Populate queue list
+        self.queue_model.reset((url, "Queued") for url in urls)
+        self.job_store.replace_queue(urls)
+        # Feed the whole queue through a single bounded scheduler
+        output_folder = str(output_folder)
+        self.download_thread = self._create_download_thread(urls, output_folder)
+        self.download_thread.start()
+
+    def resume_unfinished_downloads(self):
+        """Restart every chapter the job store still lists as unfinished, e.g. after a crash."""
+        if self.download_thread is not None and self.download_thread.isRunning():
+            self.log("A download is already running.")
+            return
+        urls = self.job_store.pending()
+        if not urls:
+            self.log("No unfinished downloads to resume.")
+            return
+        save_path = self.save_path_field.text().strip()
+        if not save_path:
+            self.log("Please select a save location.")
+            return
+        Path(save_path).mkdir(parents=True, exist_ok=True)
+        self._show_download_started()
+        for url in urls:
+            self.job_store.set_status(url, "Queued")
+            self.update_queue_status(url, "Queued")
+        self.log(f"Resuming {len(urls)} unfinished chapter(s).")
+        self.download_thread = self._create_download_thread(urls, save_path)
+        self.download_thread.start()
+
+    def _show_download_started(self):
         # Disable buttons during download
         self.download_button.setEnabled(False)
+        self.resume_unfinished_button.setEnabled(False)
         self.merge_button.setEnabled(False)
         self.volume_button.setEnabled(False)
-        # self.pause_button.setEnabled(True)  # Removed: button does not exist
-        # self.resume_button.setEnabled(False)  # Removed: button does not exist
         self.progress_bar.setVisible(True)
         self.progress_bar.setValue(0)
-        # Populate queue list
-        self.queue_list.clear()
-        self.queue = collections.OrderedDict()
-        for url in urls:
-            class QueueItemWidget(QWidget):
-                def __init__(self, url, status="Queued"):
-                    super().__init__()
-                    self.url = url
-                    self.status_label = QLabel(f"{status}: {url}")
-                    self.progress = QProgressBar()
-                    self.progress.setMinimum(0)
-                    self.progress.setMaximum(100)
-                    self.progress.setValue(0)
-                    self.progress.setFixedWidth(120)
-                    layout = QHBoxLayout()
-                    layout.addWidget(self.status_label)
-                    layout.addWidget(self.progress)
-                    layout.setContentsMargins(0, 0, 0, 0)
-                    self.setLayout(layout)
-            widget = QueueItemWidget(url)
-            item = QListWidgetItem()
-            item.setSizeHint(widget.sizeHint())
-            # Store URL and status in item data
-            item.setData(256, url)  # Qt.UserRole = 256
-            item.setData(257, "Queued")  # Custom role for status
-            self.queue_list.addItem(item)
-            self.queue_list.setItemWidget(item, widget)
-            self.queue[url] = {'status': 'Queued', 'thread': None, 'widget': widget, 'item': item}
-        # Double-click to retry failed
-        self.queue_list.itemDoubleClicked.connect(self.retry_failed_download)
-        # Right-click context menu for pause/resume
-        self.queue_list.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
-        self.queue_list.customContextMenuRequested.connect(self.show_queue_context_menu)
-        # Start a thread for each URL
-        use_selenium = self.selenium_checkbox.isChecked()
-        selenium_driver_path = self.selenium_driver_path_field.text().strip()
-        headless_mode = self.headless_checkbox.isChecked()
-        auto_merge = self.auto_merge_checkbox.isChecked()
-        output_folder = str(output_folder)
-        self.url_threads = {}
-        for url in urls:
-            thread = DownloadThread([url], output_folder, auto_merge, 1, use_selenium, selenium_driver_path, headless_mode, True)
-            thread.log_signal.connect(self.log)
-            thread.progress_signal.connect(self.update_progress)
-            thread.finished_signal.connect(self.download_finished)
-            thread.status_signal = self.update_queue_status
-            thread.url_progress_signal.connect(self.update_url_progress)
-            # Connect selenium error signal to dialog (only once)
-            if not self._connect_selenium_error_signal:
-                thread.selenium_error_signal.connect(self.show_critical_selenium_error_dialog)
-                self._connect_selenium_error_signal = True
-            self.url_threads[url] = thread
-            thread.start()
+        self.progress_bar.setFormat("%p%")
+
+    def _create_download_thread(self, urls, output_folder):
+        http_pool.configure(pool_size=self.host_pool_spin.value(), rate=self.host_rate_spin.value())
+        page_cache.max_bytes = self.page_cache_spin.value() * 1024 * 1024
+        thread = DownloadThread(
+            urls, output_folder, self.auto_merge_checkbox.isChecked(), self.concurrency_spin.value(),
+            self.selenium_checkbox.isChecked(), self.selenium_driver_path_field.text().strip(),
+            self.headless_checkbox.isChecked(), True,
+            chapter_concurrency=self.chapter_concurrency_spin.value(), plugins=self.plugins,
+            lazy_load_timeout=self.lazy_load_spin.value(),
+            engine="asyncio" if self.engine_combo.currentIndex() == 1 else "threads",
+            async_in_flight=self.async_in_flight_spin.value(),
+            deduplicate=self.dedupe_checkbox.isChecked(),
+            jpeg_passthrough=self.jpeg_passthrough_checkbox.isChecked(),
+            pdf_transform=self._pdf_transform(),
+            job_store=self.job_store
+        )
+        thread.log_signal.connect(self.log)
+        thread.snapshot_signal.connect(self.update_download_snapshot)
+        thread.finished_signal.connect(self.download_finished)
+        thread.status_signal.connect(self.update_queue_status)
+        thread.selenium_error_signal.connect(self.show_critical_selenium_error_dialog)
+        return thread
 
     def show_critical_selenium_error_dialog(self, message):
         QMessageBox.critical(self, "Selenium Error", message)
 
     def update_url_progress(self, url, value, maximum):
-        if url in self.queue:
-            widget = self.queue[url]['widget']
-            widget.progress.setMaximum(maximum)
-            widget.progress.setValue(value)
+        self.queue_model.set_progress(url, value, maximum)
 
     def show_queue_context_menu(self, pos):
-        menu = QMenu()
-        item = self.queue_list.itemAt(pos)
-        if not item:
-            return
-        url = item.data(256)
-        status = item.data(257)
-        # Robustness: check if url is still in self.queue and item is still in the widget
-        if url not in self.queue:
-            return
-        # Also check that the item is still in the list widget
-        found = False
-        for i in range(self.queue_list.count()):
-            if self.queue_list.item(i) is item:
-                found = True
-                break
-        if not found:
+        index = self.queue_list.indexAt(pos)
+        if not index.isValid():
             return
+        url = index.data(QueueModel.UrlRole)
+        status = index.data(QueueModel.StatusRole)
         menu = QMenu()
         if status in ("Downloading", "Queued"):
             pause_action = menu.addAction("Pause")
@@ -870,145 +1199,94 @@ class MangaDownloader(QWidget):
                 self.remove_url_from_queue(url)
 
     def remove_url_from_queue(self, url):
-        # Cancel thread if running
-        if hasattr(self, 'url_threads') and url in self.url_threads:
-            thread = self.url_threads[url]
-            if thread.isRunning():
-                # Try to stop the thread safely
-                if hasattr(thread, 'stop'):
-                    thread.stop()
-            del self.url_threads[url]
-        # Remove from queue UI robustly
-        if url in self.queue:
-            item = self.queue[url]['item']
-            row = self.queue_list.row(item)
-            self.queue_list.takeItem(row)
-            del self.queue[url]
+        # Cancel the chapter if it is queued or running
+        if self.download_thread is not None and self.download_thread.isRunning():
+            self.download_thread.stop_url(url)
+        self.queue_model.remove(url)
+        self.job_store.remove(url)
 
     def pause_url_download(self, url):
-        if url in self.url_threads:
-            thread = self.url_threads[url]
-            if hasattr(thread, 'pause'):
-                thread.pause()
+        if self.download_thread is not None and self.download_thread.isRunning():
+            self.download_thread.pause_url(url)
+            self.job_store.set_status(url, "Paused")
             self.update_queue_status(url, "Paused")
 
     def resume_url_download(self, url):
-        if url in self.url_threads:
-            thread = self.url_threads[url]
-            if hasattr(thread, 'resume'):
-                thread.resume()
-            self.update_queue_status(url, "Downloading")
+        if self.download_thread is not None and self.download_thread.isRunning():
+            # A chapter paused before it started goes back to the queue
+            status = "Downloading" if self.download_thread.resume_url(url) else "Queued"
+            self.job_store.set_status(url, status)
+            self.update_queue_status(url, status)
 
     def update_queue_status(self, url, status):
-        # status: 'Queued', 'Downloading', 'Completed', 'Failed', 'Skipped'
-        if url in self.queue:
-            item = self.queue[url]['item']
-            widget = self.queue[url]['widget']
-            item.setData(257, status)
-            widget.status_label.setText(f"{status}: {url}")
-            if status == 'Completed':
-                item.setForeground(Qt.GlobalColor.darkGreen)
-            elif status == 'Failed':
-                item.setForeground(Qt.GlobalColor.red)
-            elif status == 'Downloading':
-                item.setForeground(Qt.GlobalColor.blue)
-            elif status == 'Skipped':
-                item.setForeground(Qt.GlobalColor.darkYellow)
-            else:
-                item.setForeground(Qt.GlobalColor.black)
-            self.queue[url]['status'] = status
-
-    def retry_failed_download(self, item):
-        text = item.text()
-        if text.startswith("Failed: "):
-            url = text[len("Failed: "):]
-            # Re-queue and restart download for this URL only
-            item.setText(f"Queued: {url}")
-            item.setForeground(Qt.GlobalColor.black)
-            output_folder = Path(self.save_path_field.text().strip())
-            auto_merge = self.auto_merge_checkbox.isChecked()
-            concurrency = 1  # Only one for retry
-            use_selenium = self.selenium_checkbox.isChecked()
-            selenium_driver_path = self.selenium_driver_path_field.text().strip()
-            headless_mode = self.headless_checkbox.isChecked()
-            # Start a new thread for this single URL
-            thread = DownloadThread([url], str(output_folder), auto_merge, concurrency, use_selenium, selenium_driver_path, headless_mode)
-            thread.log_signal.connect(self.log)
-            thread.progress_signal.connect(self.update_progress)
-            thread.finished_signal.connect(self.download_finished)
-            thread.status_signal = self.update_queue_status
-            thread.start()
-
-    def _get_queue_state_path(self):
+        # status: 'Queued', 'Downloading', 'Completed', 'Incomplete', 'Failed', 'Skipped'
+        self.queue_model.set_status(url, status)
+
+    def retry_failed_download(self, index):
+        url = index.data(QueueModel.UrlRole)
+        if url and index.data(QueueModel.StatusRole) in ("Failed", "Incomplete"):
+            # Re-queue on the running scheduler, or start a new one for this URL only
+            self.job_store.set_status(url, "Queued")
+            self.update_queue_status(url, "Queued")
+            thread = self.download_thread
+            if thread is None or not thread.isRunning() or not thread.add_url(url):
+                output_folder = Path(self.save_path_field.text().strip())
+                self.download_thread = self._create_download_thread([url], str(output_folder))
+                self.download_thread.start()
+
+    def _get_job_store_path(self):
+        home = Path.home()
+        return home / ".manga_downloader_jobs.sqlite3"
+
+    def _get_legacy_queue_path(self):
         home = Path.home()
         return home / ".manga_downloader_queue.json"
 
     def save_queue_state(self):
-        # Save URLs and statuses using self.queue
-        if hasattr(self, 'queue'):
-            queue = []
-            for url, entry in self.queue.items():
-                # entry['item'] is a QListWidgetItem, entry['widget'] is the widget
-                item = entry.get('item')
-                status = entry.get('status', 'Queued')
-                if item is not None:
-                    # Try to get status from item text if possible
-                    text = item.text() if hasattr(item, 'text') else ''
-                    if ": " in text:
-                        status = text.split(": ", 1)[0]
-                queue.append({"url": url, "status": status})
-            try:
-                with open(self._get_queue_state_path(), "w", encoding="utf-8") as f:
-                    json.dump(queue, f)
-            except Exception:
-                pass
+        # Statuses and progress are written to the job store as they change; just close it
+        # (a running download still needs it until its workers exit)
+        if self.download_thread is None or not self.download_thread.isRunning():
+            self.job_store.close()
 
     def restore_queue_state(self):
-        try:
-            path = self._get_queue_state_path()
-            if path.exists():
-                with open(path, "r", encoding="utf-8") as f:
+        legacy_path = self._get_legacy_queue_path()
+        if legacy_path.exists():
+            # One-time import of the JSON queue file used by older versions
+            try:
+                with open(legacy_path, "r", encoding="utf-8") as f:
                     queue = json.load(f)
-                self.queue_list.clear()
-                self.queue = collections.OrderedDict()
-                for entry in queue:
-                    from PySide6.QtWidgets import QListWidgetItem, QWidget, QHBoxLayout, QLabel, QProgressBar
-                    # Recreate the custom widget as in download_images
-                    class QueueItemWidget(QWidget):
-                        def __init__(self, url, status="Queued"):
-                            super().__init__()
-                            self.url = url
-                            self.status_label = QLabel(f"{status}: {url}")
-                            self.progress = QProgressBar()
-                            self.progress.setMinimum(0)
-                            self.progress.setMaximum(100)
-                            self.progress.setValue(0)
-                            self.progress.setFixedWidth(120)
-                            layout = QHBoxLayout()
-                            layout.addWidget(self.status_label)
-                            layout.addWidget(self.progress)
-                            layout.setContentsMargins(0, 0, 0, 0)
-                            self.setLayout(layout)
-                    widget = QueueItemWidget(entry['url'], entry['status'])
-                    item = QListWidgetItem()
-                    item.setSizeHint(widget.sizeHint())
-                    self.queue_list.addItem(item)
-                    self.queue_list.setItemWidget(item, widget)
-                    self.queue[entry['url']] = {'status': entry['status'], 'item': item, 'widget': widget, 'thread': None}
-        except Exception:
-            pass
+                if not self.job_store.chapters():
+                    self.job_store.add(entry['url'] for entry in queue)
+                    for entry in queue:
+                        self.job_store.set_status(entry['url'], entry.get('status', 'Queued'))
+                legacy_path.unlink()
+            except (OSError, ValueError, KeyError, TypeError):
+                pass
+        self.queue_model.reset(self.job_store.chapters())
 
     def _on_close_event(self, event):
         self.save_queue_state()
+        self.settings.flush()
         if hasattr(self, '_orig_closeEvent'):
             self._orig_closeEvent(event)
 
-    def update_progress(self, value, maximum):
-        self.progress_bar.setMaximum(maximum)
-        self.progress_bar.setValue(value)
+    def update_download_snapshot(self, snapshot):
+        """Apply one coalesced progress snapshot from the download job."""
+        self.progress_bar.setMaximum(max(snapshot["pages_total"], 1))
+        self.progress_bar.setValue(snapshot["pages_done"])
+        text = f"%v/%m pages · {_format_bytes(snapshot['bytes'])}"
+        if snapshot["bytes_per_sec"]:
+            text += f" · {_format_bytes(snapshot['bytes_per_sec'])}/s"
+        if snapshot["eta"] is not None:
+            minutes, seconds = divmod(int(snapshot["eta"]), 60)
+            text += f" · ETA {minutes // 60}:{minutes % 60:02d}:{seconds:02d}"
+        self.progress_bar.setFormat(text)
+        for url, (done, total) in snapshot["chapters"].items():
+            self.update_url_progress(url, done, total)
 
     def download_finished(self):
         self.download_button.setEnabled(True)
+        self.resume_unfinished_button.setEnabled(True)
         self.merge_button.setEnabled(True)
         self.volume_button.setEnabled(True)
         self.progress_bar.setVisible(False)
@@ -1039,63 +1317,46 @@ class MangaDownloader(QWidget):
         if selected_names:
             subfolders = [parent_folder / name for name in selected_names if (parent_folder / name).is_dir()]
         else:
-            subfolders = [f for f in parent_folder.iterdir() if f.is_dir()]
+            subfolders = [f for f in parent_folder.iterdir() if f.is_dir() and not f.name.startswith('.')]
         if not subfolders:
             self.pdf_log("No subfolders found to merge from.", level="warning")
             return
-        last_pdf = None
         mode = self.merge_mode_combo.currentText() if hasattr(self, 'merge_mode_combo') else "Merge Images"
-        if mode == "Merge Images":
-            for folder in subfolders:
-                image_files = sorted(folder.glob('*'))
-                image_files = [f for f in image_files if f.suffix.lower() in ('.png', '.jpg', '.jpeg', '.bmp', '.gif', '.webp')]
-                if not image_files:
-                    self.pdf_log(f"No images found in {folder}.", level="warning")
-                    continue
-                images = []
-                for img_path in image_files:
-                    try:
-                        img = Image.open(str(img_path))
-                        if img.mode != 'RGB':
-                            img = img.convert('RGB')
-                        images.append(img)
-                    except Exception as e:
-                        self.pdf_log(f"Failed to open {img_path}: {e}", level="error")
-                if images:
-                    pdf_path = folder / (folder.name + '.pdf')
-                    try:
-                        images[0].save(str(pdf_path), save_all=True, append_images=images[1:])
-                        self.pdf_log(f"PDF created: {pdf_path}", level="success")
-                        last_pdf = str(pdf_path)
-                    except Exception as e:
-                        self.pdf_log(f"Failed to create PDF in {folder}: {e}", level="error")
-                else:
-                    self.pdf_log(f"No valid images to merge in {folder}.", level="warning")
-        elif mode == "Merge PDFs":
-            for folder in subfolders:
-                pdf_files = sorted(folder.glob('*.pdf'))
-                if not pdf_files:
-                    self.pdf_log(f"No PDFs found in {folder}.", level="warning")
-                    continue
-                if pypdf is None:
-                    self.pdf_log("pypdf or PyPDF2 is required to merge PDFs.", level="error")
-                    return
-                merger = pypdf.PdfWriter()
-                for pdf_path in pdf_files:
-                    try:
-                        reader = pypdf.PdfReader(str(pdf_path))
-                        for page in reader.pages:
-                            merger.add_page(page)
-                    except Exception as e:
-                        self.pdf_log(f"Failed to read {pdf_path}: {e}", level="error")
-                merged_pdf_path = folder / (folder.name + '_merged.pdf')
-                try:
-                    with open(merged_pdf_path, "wb") as f:
-                        merger.write(f)
-                    self.pdf_log(f"Merged PDF created: {merged_pdf_path}", level="success")
-                    last_pdf = str(merged_pdf_path)
-                except Exception as e:
-                    self.pdf_log(f"Failed to create merged PDF in {folder}: {e}", level="error")
+        if mode == "Merge PDFs" and load_pypdf() is None:
+            self.pdf_log("pypdf or PyPDF2 is required to merge PDFs.", level="error")
+            return
+        # Chapters are merged in parallel worker processes; the window stays responsive
+        self.merge_button.setEnabled(False)
+        self.volume_button.setEnabled(False)
+        self.pdf_progress_bar.setValue(0)
+        self.pdf_progress_bar.setVisible(True)
+        self.merge_thread = PDFMergeThread(
+            [str(f) for f in subfolders], mode, self.jpeg_passthrough_checkbox.isChecked(), transform=self._pdf_transform()
+        )
+        self.merge_thread.log_signal.connect(self.pdf_log)
+        self.merge_thread.progress_signal.connect(self.update_pdf_progress)
+        self.merge_thread.finished_signal.connect(self.merge_finished)
+        self.merge_thread.start()
+
+    def _pdf_transform(self):
+        """PageTransform from the settings tab, or None when pages are kept as downloaded."""
+        transform = PageTransform(
+            self.pdf_max_width_spin.value(), self.pdf_grayscale_checkbox.isChecked(), self.pdf_quality_spin.value(),
+            self.pdf_split_strips_checkbox.isChecked()
+        )
+        if (not transform.max_width and not transform.grayscale and not transform.split_strips
+                and transform.jpeg_quality == PDF_JPEG_QUALITY):
+            return None
+        return transform
+
+    def update_pdf_progress(self, value, maximum):
+        self.pdf_progress_bar.setMaximum(maximum)
+        self.pdf_progress_bar.setValue(value)
+
+    def merge_finished(self, last_pdf):
+        self.merge_button.setEnabled(True)
+        self.volume_button.setEnabled(True)
+        self.pdf_progress_bar.setVisible(False)
         # Show open PDF button if a PDF was created
         if last_pdf:
             self.last_pdf_path = last_pdf
@@ -1118,7 +1379,7 @@ class MangaDownloader(QWidget):
         if not parent_folder or not parent_folder.is_dir():
             QMessageBox.warning(self, "Invalid Folder", "Please select a valid parent folder first.")
             return
-        subfolders = [f for f in parent_folder.iterdir() if f.is_dir()]
+        subfolders = [f for f in parent_folder.iterdir() if f.is_dir() and not f.name.startswith('.')]
         if not subfolders:
             QMessageBox.warning(self, "No Subfolders", "No subfolders found to select.")
             return
@@ -1197,7 +1458,7 @@ class MangaDownloader(QWidget):
             self.pdf_log("Please select a valid save location.", level="warning")
             return
         # For simplicity, use all subfolders (since QFileDialog.getExistingDirectory does not support multi-select in PyQt6)
-        subfolders = [f for f in output_folder.iterdir() if f.is_dir()]
+        subfolders = [f for f in output_folder.iterdir() if f.is_dir() and not f.name.startswith('.')]
         if not subfolders:
             self.pdf_log("No chapter folders found.", level="warning")
             return
@@ -1207,14 +1468,31 @@ class MangaDownloader(QWidget):
             self.pdf_log("No output file selected.", level="warning")
             return
         # Start worker thread
-        self.volume_thread = VolumePDFThread([str(f) for f in subfolders], pdf_path)
+        concat_pdfs = self.merge_mode_combo.currentText() == "Merge PDFs"
+        if concat_pdfs and load_pypdf() is None:
+            self.pdf_log("pypdf or PyPDF2 is required to merge PDFs.", level="error")
+            return
+        self.volume_thread = VolumePDFThread(
+            [str(f) for f in subfolders], pdf_path, self.jpeg_passthrough_checkbox.isChecked(),
+            concat_pdfs=concat_pdfs, transform=self._pdf_transform()
+        )
         self.volume_thread.log_signal.connect(lambda msg: self.pdf_log(msg))
-        self.volume_thread.finished_signal.connect(lambda: self.pdf_log("Volume PDF process finished.", level="success"))
+        self.volume_thread.progress_signal.connect(self.update_pdf_progress)
+        self.volume_thread.finished_signal.connect(self.volume_finished)
+        self.volume_button.setEnabled(False)
+        self.pdf_progress_bar.setValue(0)
+        self.pdf_progress_bar.setVisible(True)
         self.volume_thread.start()
 
+    def volume_finished(self):
+        self.volume_button.setEnabled(True)
+        self.pdf_progress_bar.setVisible(False)
+        self.pdf_log("Volume PDF process finished.", level="success")
+
     def open_edit_pdf_dialog(self):
     # PySide6 widgets already imported at module top
         import os
+        pypdf = load_pypdf()
         if pypdf is None:
             QMessageBox.warning(self, "Missing Dependency", "pypdf or PyPDF2 is required for PDF editing.")
             return
@@ -1370,398 +1648,69 @@ class MangaDownloader(QWidget):
         dlg = EditPDFDialog(self)
         dlg.exec()
 
-import threading
+class _JobThread(QThread):
+    """Runs a manga_core job on a QThread, re-emitting its JobSignals as the Qt signals of the same name."""
+    job_class = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self.job = self.job_class(*args, **kwargs)
+        for name, attr in vars(self.job_class).items():
+            if isinstance(attr, JobSignal):
+                getattr(self.job, name).connect(getattr(self, name).emit)
+
+    def run(self):
+        self.job.run()
+
 
-class DownloadThread(QThread):
+class DownloadThread(_JobThread):
+    """Qt front end of DownloadJob, the scheduler for a whole queue of chapter URLs."""
+    job_class = DownloadJob
     log_signal = pyqtSignal(str)
-    progress_signal = pyqtSignal(int, int)
     finished_signal = pyqtSignal()
-    url_progress_signal = pyqtSignal(str, int, int)  # url, value, max
+    snapshot_signal = pyqtSignal(dict)
+    status_signal = pyqtSignal(str, str)  # url, status
     selenium_error_signal = pyqtSignal(str)
 
-    def __init__(self, urls, output_folder, auto_merge, concurrency, use_selenium=False, selenium_driver_path="", headless_mode=True, log_num_images_found=True):
-        super().__init__()
-        self.urls = urls
-        self.output_folder = output_folder
-        self.auto_merge = auto_merge
-        self.concurrency = concurrency
-        self.use_selenium = use_selenium
-        self.selenium_driver_path = selenium_driver_path
-        self.headless_mode = headless_mode
-        self.log_num_images_found = True  # Always log
-        self._pause_event = threading.Event()
-        self._pause_event.set()  # Not paused by default
-        self._stop_event = threading.Event()
-        self._stop_event.clear()
-
     def stop(self):
-        self._stop_event.set()
-        self._pause_event.set()  # Unpause if paused, so thread can exit
+        self.job.stop()
 
     def pause(self):
-        self._pause_event.clear()
+        self.job.pause()
 
     def resume(self):
-        self._pause_event.set()
+        self.job.resume()
+
+    def pause_url(self, url):
+        self.job.pause_url(url)
+
+    def resume_url(self, url):
+        return self.job.resume_url(url)
+
+    def stop_url(self, url):
+        self.job.stop_url(url)
+
+    def add_url(self, url):
+        return self.job.add_url(url)
 
-    def run(self):
-        import re
-        total_downloaded = 0
-        driver = None
-        if self.use_selenium and webdriver is not None:
-            chrome_options = ChromeOptions()
-            if self.headless_mode:
-                chrome_options.add_argument('--headless')
-            chrome_options.add_argument('--disable-gpu')
-            driver_path = self.selenium_driver_path if self.selenium_driver_path else None
-            from selenium.webdriver.chrome.service import Service as ChromeService
-            try:
-                if driver_path:
-                    driver = webdriver.Chrome(service=ChromeService(driver_path), options=chrome_options)
-                else:
-                    driver = webdriver.Chrome(options=chrome_options)
-            except Exception as e:
-                error_msg = f"Failed to initialize Selenium driver: {e}"
-                self.log_signal.emit(error_msg)
-                self.selenium_error_signal.emit(error_msg)
-                driver = None
-        try:
-            for url in self.urls:
-                # Check for stop event
-                if self._stop_event.is_set():
-                    self.log_signal.emit("Download stopped by user.")
-                    break
-                # Per-URL pause support
-                if hasattr(self, '_pause_event'):
-                    while not self._pause_event.is_set():
-                        self.msleep(100)
-                self.log_signal.emit(f"\nProcessing: {url}")
-                parsed = urlparse(url)
-                path_parts = [p for p in parsed.path.split('/') if p]
-                folder_name = parsed.netloc
-                chapter_pattern = re.compile(r'(vol\d+[-_ ]*)?(ch|chapter)[-_ ]*(\d+)', re.IGNORECASE)
-                chapter_name = None
-                for part in reversed(path_parts):
-                    match = chapter_pattern.search(part)
-                    if match:
-                        chapter_name = match.group(0).replace('_', '-').replace(' ', '-')
-                        break
-                if not chapter_name and path_parts:
-                    chapter_name = path_parts[-1]
-                if chapter_name:
-                    folder_name = f"{parsed.netloc}_{chapter_name}"
-                folder_name = folder_name.replace(':', '_').replace('?', '_').replace('&', '_').replace('=', '_')
-                url_folder = os.path.join(self.output_folder, folder_name)
-                os.makedirs(url_folder, exist_ok=True)
-                headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36"}
-                try:
-                    response = requests.get(url, headers=headers)
-                    response.raise_for_status()
-                except Exception as e:
-                    self.log_signal.emit(f"Failed to fetch page: {e}")
-                    continue
-                # Use plugin system for image extraction
-                image_urls = None
-                for plugin in getattr(self.parent(), 'plugins', []):
-                    if plugin.can_handle(url):
-                        try:
-                            image_urls = plugin.get_image_urls(url)
-                            break
-                        except Exception as e:
-                            self.log_signal.emit(f"Plugin error for {url}: {e}")
-                if image_urls is None:
-                    # fallback: try to extract all <img> tags
-                    try:
-                        if self.use_selenium and webdriver is not None and driver is not None:
-                            import time
-                            from selenium.common.exceptions import TimeoutException, WebDriverException
-                            from selenium.webdriver.support.ui import WebDriverWait
-                            from selenium.webdriver.support import expected_conditions as EC
-                            max_retries = 3
-                            for attempt in range(1, max_retries + 1):
-                                try:
-                                    driver.get(url)
-                                    # Scroll to bottom to trigger lazy loading (increase attempts)
-                                    last_height = driver.execute_script("return document.body.scrollHeight")
-                                    for _ in range(10):
-                                        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                                        time.sleep(1.5)
-                                        new_height = driver.execute_script("return document.body.scrollHeight")
-                                        if new_height == last_height:
-                                            break
-                                        last_height = new_height
-                                    # Wait for images to load
-                                    try:
-                                        WebDriverWait(driver, 15).until(
-                                            EC.presence_of_all_elements_located((By.TAG_NAME, "img"))
-                                        )
-                                    except Exception:
-                                        pass
-                                    img_elements = driver.find_elements(By.TAG_NAME, "img")
-                                    image_urls = [img.get_attribute("src") for img in img_elements if img.get_attribute("src")]
-                                    break  # Success, exit retry loop
-                                except (TimeoutException, WebDriverException) as e:
-                                    if attempt == max_retries:
-                                        self.log_signal.emit(f"Selenium error for {url}: {e}")
-                                        image_urls = []
-                                    else:
-                                        self.log_signal.emit(f"Selenium timeout/error for {url}, retrying ({attempt}/{max_retries})...")
-                                        time.sleep(2)
-                        else:
-                            response = requests.get(url)
-                            response.raise_for_status()
-                            soup = BeautifulSoup(response.text, "html.parser")
-                            img_tags = soup.find_all("img")
-                            image_urls = [urljoin(url, img.get("src")) for img in img_tags if img.get("src")]
-                    except Exception as e:
-                        self.log_signal.emit(f"Failed to fetch page: {e}")
-                        continue
-                downloaded = 0
-                img_tags = []
-                # Convert image_urls to dummy img_tag-like objects for compatibility
-                class DummyImg:
-                    def __init__(self, src):
-                        self._src = src
-                    def get(self, key):
-                        return self._src if key == "src" else None
-                img_tags = [DummyImg(src) for src in image_urls]
-                # Log number of images found if enabled
-                if self.log_num_images_found:
-                    self.log_signal.emit(f"Number of images found for {url}: {len(img_tags)}")
-                from concurrent.futures import ThreadPoolExecutor, as_completed
-                import re
-                def normalize_filename(name):
-                    # Remove or replace problematic characters
-                    name = re.sub(r'[\\/:*?"<>|]', '_', name)
-                    name = re.sub(r'\s+', '_', name)
-                    return name
-
-                def download_image(img, session, headers, retries=3, timeout=10):
-                    import traceback
-                    # Early exit if stop requested
-                    if self._stop_event.is_set():
-                        return False, None, None
-                    img_url = img.get("src")
-                    if not img_url:
-                        return False, None, None
-                    img_url_full = urljoin(url, img_url)
-                    img_name = os.path.basename(urlparse(img_url_full).path)
-                    if not img_name:
-                        return False, img_url_full, None
-                    img_name = normalize_filename(img_name)
-                    # Check for extension
-                    root, ext = os.path.splitext(img_name)
-                    # Ensure unique filename to avoid overwrites
-                    img_path = os.path.join(url_folder, img_name)
-                    base_img_name = root
-                    counter = 1
-                    while os.path.exists(img_path):
-                        # Append _1, _2, etc. before extension
-                        img_name = f"{base_img_name}_{counter}{ext}"
-                        img_path = os.path.join(url_folder, img_name)
-                        counter += 1
-                    last_exception = None
-                    last_trace = None
-                    for attempt in range(1, retries + 1):
-                        # Early exit if stop requested
-                        if self._stop_event.is_set():
-                            return False, None, None
-                        try:
-                            img_data = session.get(img_url_full, headers=headers, timeout=timeout)
-                            # Check for permanent errors (404, 410)
-                            if img_data.status_code in (404, 410):
-                                return False, img_url_full, f"HTTP {img_data.status_code} (permanent error, not retried)"
-                            img_data.raise_for_status()
-                            # If no extension, use Content-Type to determine extension
-                            if not ext:
-                                content_type = img_data.headers.get('Content-Type', '').lower()
-                                ext_map = {
-                                    'image/jpeg': '.jpg',
-                                    'image/jpg': '.jpg',
-                                    'image/png': '.png',
-                                    'image/gif': '.gif',
-                                    'image/bmp': '.bmp',
-                                    'image/webp': '.webp',
-                                }
-                                new_ext = ext_map.get(content_type, '')
-                                if new_ext:
-                                    img_name = root + new_ext
-                                    img_path = os.path.join(url_folder, img_name)
-                            with open(img_path, "wb") as f:
-                                f.write(img_data.content)
-                            return True, img_name, None
-                        except requests.HTTPError as e:
-                            # Permanent error: do not retry on 4xx except 408 (timeout)
-                            if hasattr(e.response, 'status_code') and e.response is not None:
-                                code = e.response.status_code
-                                if code in (404, 410) or (400 <= code < 500 and code != 408):
-                                    return False, img_url_full, f"HTTP {code} (permanent error, not retried)"
-                            last_exception = e
-                            last_trace = traceback.format_exc()
-                        except (requests.ConnectionError, requests.Timeout) as e:
-                            # Transient error: retry
-                            last_exception = e
-                            last_trace = traceback.format_exc()
-                        except Exception as e:
-                            last_exception = e
-                            last_trace = traceback.format_exc()
-                    return False, img_url_full, f"{last_exception}\n{last_trace}" if last_exception else None
-
-                downloaded = 0
-                total_imgs = len(img_tags)
-                completed_imgs = 0
-                with requests.Session() as session:
-                    with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
-                        futures = {executor.submit(download_image, img, session, headers): img for img in img_tags}
-                        last_progress_emit = 0
-                        last_url_progress_emit = 0
-                        progress_emit_interval = max(1, total_imgs // 100)  # Emit at most 100 times
-                        for future in as_completed(futures):
-                            # Pause support
-                            while not self._pause_event.is_set():
-                                self.msleep(100)
-                            # Early exit if stop requested
-                            if self._stop_event.is_set():
-                                break
-                            success, name_or_url, err = future.result()
-                            completed_imgs += 1
-                            # Throttle progress signal emissions
-                            if completed_imgs - last_progress_emit >= progress_emit_interval or completed_imgs == total_imgs:
-                                self.progress_signal.emit(completed_imgs, total_imgs)
-                                last_progress_emit = completed_imgs
-                            if completed_imgs - last_url_progress_emit >= progress_emit_interval or completed_imgs == total_imgs:
-                                self.url_progress_signal.emit(url, completed_imgs, total_imgs)
-                                last_url_progress_emit = completed_imgs
-                            # Log every successful download, skip, or failure
-                            if success is True:
-                                self.log_signal.emit(f"Downloaded: {name_or_url}")
-                                downloaded += 1
-                            elif success == 'skipped':
-                                self.log_signal.emit(f"Skipped existing: {name_or_url}")
-                            elif not success and name_or_url:
-                                self.log_signal.emit(f"Failed to download {name_or_url}: {err}")
-                        # If stop requested, cancel remaining futures
-                        if self._stop_event.is_set():
-                            for fut in futures:
-                                fut.cancel()
-                            break
-                self.log_signal.emit(f"Images downloaded from this page: {downloaded}")
-                total_downloaded += downloaded
-                # Auto-merge to PDF if enabled
-                if self.auto_merge and downloaded > 0:
-                    self._merge_images_to_pdf(url_folder)
-        finally:
-            if driver is not None:
-                driver.quit()
-        self.log_signal.emit(f"\nTotal images downloaded from all URLs: {total_downloaded}")
-        self.finished_signal.emit()
-
-    def _merge_images_to_pdf(self, folder):
-        import glob
-        import re
-        from PIL import Image
-        def natural_key(s):
-            return [int(text) if text.isdigit() else text.lower() for text in re.split(r'(\d+)', os.path.basename(s))]
-        image_files = glob.glob(os.path.join(folder, '*'))
-        image_files = [f for f in image_files if f.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp', '.gif', '.webp'))]
-        image_files.sort(key=natural_key)
-        if not image_files:
-            self.log_signal.emit(f"[Auto-Merge] No images found in {folder}.")
-            return
-        pdf_path = os.path.join(folder, os.path.basename(folder) + '.pdf')
-        valid_images = []
-        max_w, max_h = 0, 0
-        # First pass: determine max size and filter valid images
-        for img_path in image_files:
-            try:
-                img = Image.open(img_path)
-                if img.mode != 'RGB':
-                    img = img.convert('RGB')
-                max_w = max(max_w, img.width)
-                max_h = max(max_h, img.height)
-                valid_images.append(img_path)
-            except Exception as e:
-                self.log_signal.emit(f"[Auto-Merge] Failed to open {img_path}: {e}")
-        if not valid_images:
-            self.log_signal.emit(f"[Auto-Merge] No valid images to merge in {folder}.")
-            return
-        try:
-            # Streaming approach: write images one by one
-            first_img = None
-            padded_paths = []
-            from tempfile import NamedTemporaryFile
-            for idx, img_path in enumerate(valid_images):
-                try:
-                    img = Image.open(img_path)
-                    if img.mode != 'RGB':
-                        img = img.convert('RGB')
-                    new_img = Image.new('RGB', (max_w, max_h), (255, 255, 255))
-                    offset = ((max_w - img.width) // 2, (max_h - img.height) // 2)
-                    new_img.paste(img, offset)
-                    # Save each padded image as a temporary file
-                    temp_file = NamedTemporaryFile(delete=False, suffix='.jpg')
-                    new_img.save(temp_file.name, format='JPEG')
-                    padded_paths.append(temp_file.name)
-                    temp_file.close()
-                    if first_img is None:
-                        first_img = new_img
-                except Exception as e:
-                    self.log_signal.emit(f"[Auto-Merge] Failed to process {img_path}: {e}")
-            if not padded_paths:
-                self.log_signal.emit(f"[Auto-Merge] No valid images to merge in {folder}.")
-                return
-            # Save to PDF incrementally
-            try:
-                images_iter = (Image.open(p) for p in padded_paths)
-                first = next(images_iter)
-                first.save(pdf_path, save_all=True, append_images=list(images_iter))
-                self.log_signal.emit(f"[Auto-Merge] PDF created: {pdf_path}")
-            except Exception as e:
-                self.log_signal.emit(f"[Auto-Merge] Failed to create PDF in {folder}: {e}")
-            finally:
-                # Clean up temp files
-                for p in padded_paths:
-                    try:
-                        os.remove(p)
-                    except Exception:
-                        pass
-        except Exception as e:
-            self.log_signal.emit(f"[Auto-Merge] Unexpected error: {e}")
 
-class VolumePDFThread(QThread):
+class PDFMergeThread(_JobThread):
+    job_class = PDFMergeJob
+    log_signal = pyqtSignal(str, str)  # message, level
+    progress_signal = pyqtSignal(int, int)
+    finished_signal = pyqtSignal(str)  # last PDF created ("" if none)
+
+
+class VolumePDFThread(_JobThread):
+    job_class = VolumePDFJob
     log_signal = pyqtSignal(str)
+    progress_signal = pyqtSignal(int, int)
     finished_signal = pyqtSignal()
 
-    def __init__(self, subfolders, pdf_path):
-        super().__init__()
-        self.subfolders = subfolders
-        self.pdf_path = pdf_path
 
-    def run(self):
-        all_images = []
-        for folder in sorted(self.subfolders):
-            image_files = sorted(glob.glob(os.path.join(folder, '*')))
-            image_files = [f for f in image_files if f.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp', '.gif', '.webp'))]
-            for img_path in image_files:
-                try:
-                    img = Image.open(img_path)
-                    if img.mode != 'RGB':
-                        img = img.convert('RGB')
-                    all_images.append(img)
-                except Exception as e:
-                    self.log_signal.emit(f"Failed to open {img_path}: {e}")
-        if all_images:
-            try:
-                all_images[0].save(self.pdf_path, save_all=True, append_images=all_images[1:])
-                self.log_signal.emit(f"Volume PDF created: {self.pdf_path}")
-            except Exception as e:
-                self.log_signal.emit(f"Failed to create volume PDF: {e}")
-        else:
-            self.log_signal.emit("No valid images to merge for volume.")
-        self.finished_signal.emit()
-
-    
 def main():
+    import multiprocessing
+    multiprocessing.freeze_support()
     # High-DPI scaling is now handled automatically by Qt/PySide6
     app = QApplication(sys.argv)
     window = MangaDownloader()
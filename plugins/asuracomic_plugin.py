@@ -1,16 +1,33 @@
-import time
 import os
 from plugins.base_plugin import MangaSitePlugin
+from plugins.browser_utils import wait_for_lazy_images
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
 
 class AsuraComicPlugin(MangaSitePlugin):
+    # Images are rendered by JS, so the page is loaded in the browser only
+    uses_page_html = False
+    domains = ("asurascans.com", "asuracomic.net")
+
     def can_handle(self, url: str) -> bool:
-        return "asurascans.com" in url or "asuracomic.net" in url
+        return any(domain in url for domain in self.domains)
+
+    def get_image_urls(self, url: str, html: str = None) -> list:
+        # Reuse a warm browser from the downloader's pool when available
+        if self.driver_pool is not None:
+            with self.driver_pool.lease() as driver:
+                return self._extract_image_urls(driver, url)
+        driver = self._start_driver()
+        if driver is None:
+            return []
+        try:
+            return self._extract_image_urls(driver, url)
+        finally:
+            driver.quit()
 
-    def get_image_urls(self, url: str) -> list:
+    def _start_driver(self):
         options = Options()
         # Do NOT add headless, so Chrome window is visible
         options.add_argument("--no-sandbox")
@@ -25,23 +42,16 @@ class AsuraComicPlugin(MangaSitePlugin):
             pass
         try:
             if chromedriver_path and os.path.exists(chromedriver_path):
-                driver = webdriver.Chrome(executable_path=chromedriver_path, options=options)
-            else:
-                driver = webdriver.Chrome(ChromeDriverManager().install(), options=options)
+                return webdriver.Chrome(executable_path=chromedriver_path, options=options)
+            return webdriver.Chrome(ChromeDriverManager().install(), options=options)
         except Exception as e:
             print(f"[PLUGIN ERROR] Failed to start ChromeDriver: {e}")
-            return []
+            return None
+
+    def _extract_image_urls(self, driver, url: str) -> list:
         driver.get(url)
-        # Auto-scroll to bottom to trigger lazy loading
-        last_height = driver.execute_script("return document.body.scrollHeight")
-        scroll_pause = 1.0
-        for _ in range(20):
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(scroll_pause)
-            new_height = driver.execute_script("return document.body.scrollHeight")
-            if new_height == last_height:
-                break
-            last_height = new_height
+        # Scroll until lazy-loaded images stop appearing
+        wait_for_lazy_images(driver, self.lazy_load_timeout)
         # Robust image extraction from live DOM
         valid_exts = (".jpg", ".jpeg", ".png", ".webp")
         image_urls = []
@@ -59,5 +69,4 @@ class AsuraComicPlugin(MangaSitePlugin):
                     image_urls.append(src)
             except Exception:
                 continue
-        driver.quit()
         return image_urls
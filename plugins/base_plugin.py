@@ -1,12 +1,29 @@
 from abc import ABC, abstractmethod
 
 class MangaSitePlugin(ABC):
+    # Set to False if the plugin loads the page itself (e.g. in a browser),
+    # so the downloader does not pre-fetch HTML the plugin never reads.
+    uses_page_html = True
+    # Shared WebDriverPool injected by the downloader while a download runs;
+    # lease browsers with ``with self.driver_pool.lease() as driver:``.
+    driver_pool = None
+    # Ceiling in seconds for plugin lazy-load waits (set from the downloader's settings)
+    lazy_load_timeout = 15.0
+    # Literal tuple of URL substrings this plugin handles. When declared, the
+    # downloader registers the plugin without importing its module and only
+    # loads it (and calls can_handle) once a URL contains one of them.
+    domains = ()
+
     @abstractmethod
     def can_handle(self, url: str) -> bool:
         """Return True if this plugin can handle the given URL."""
         pass
 
     @abstractmethod
-    def get_image_urls(self, url: str) -> list:
-        """Return a list of image URLs for the given manga page URL."""
+    def get_image_urls(self, url: str, html: str = None) -> list:
+        """Return a list of image URLs for the given manga page URL.
+
+        html is the page body already fetched by the downloader, or None
+        if it was not fetched (see uses_page_html).
+        """
         pass
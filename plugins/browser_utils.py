@@ -0,0 +1,47 @@
+"""Selenium helpers shared by the downloader core and site plugins."""
+
+# Scrolls one viewport per tick and resolves once the page height, image
+# count, pending (not yet complete) images and resource-timing entries have
+# all been unchanged for quietMs with nothing pending, or once maxMs passes.
+_WAIT_FOR_IMAGES_JS = """
+var quietMs = arguments[0], maxMs = arguments[1], done = arguments[arguments.length - 1];
+var start = Date.now(), lastChange = start, lastSig = null;
+function tick() {
+    var body = document.body || document.documentElement;
+    var atBottom = window.innerHeight + window.scrollY >= body.scrollHeight - 2;
+    if (!atBottom) {
+        window.scrollBy(0, window.innerHeight);
+    }
+    var imgs = document.images, pending = 0;
+    for (var i = 0; i < imgs.length; i++) {
+        if (!imgs[i].complete) pending++;
+    }
+    var resources = performance.getEntriesByType ? performance.getEntriesByType('resource').length : 0;
+    var sig = [body.scrollHeight, imgs.length, pending, resources, atBottom].join(':');
+    var now = Date.now();
+    if (sig !== lastSig) {
+        lastSig = sig;
+        lastChange = now;
+    }
+    var timedOut = now - start >= maxMs;
+    if ((atBottom && pending === 0 && now - lastChange >= quietMs) || timedOut) {
+        done({images: imgs.length, pending: pending, timedOut: timedOut, elapsedMs: now - start});
+    } else {
+        setTimeout(tick, 100);
+    }
+}
+tick();
+"""
+
+DEFAULT_LAZY_LOAD_TIMEOUT = 15.0
+
+
+def wait_for_lazy_images(driver, timeout=DEFAULT_LAZY_LOAD_TIMEOUT, quiet=0.75):
+    """Scroll the loaded page until its image set stops changing.
+
+    Returns as soon as the page is at the bottom, every <img> reports
+    complete and nothing has changed for ``quiet`` seconds, or after
+    ``timeout`` seconds at most. Returns the dict reported by the page.
+    """
+    driver.set_script_timeout(timeout + 5)
+    return driver.execute_async_script(_WAIT_FOR_IMAGES_JS, int(quiet * 1000), int(timeout * 1000))